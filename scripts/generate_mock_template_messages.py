@@ -195,18 +195,9 @@ def write_mock_failures(found_failures: Dict[str, List[Dict[str, Any]]], output_
     else:
         logger.info("No new failure examples added")
 
-def parse_message(msg_id: str, service: Any) -> Dict[str, Any]:
-    """Parse a message using TransactionParser"""
-    parser = TransactionParser()
-    
+def parse_message(msg: Dict[str, Any], parser: TransactionParser) -> Dict[str, Any]:
+    """Parse an already fetched full message using TransactionParser"""
     try:
-        # Get full message
-        msg = service.users().messages().get(
-            userId='me',
-            id=msg_id,
-            format='full'
-        ).execute()
-        
         # Parse with TransactionParser
         parsed_data = parser.parse_gmail_message(msg) or {}
         
@@ -231,7 +222,7 @@ def parse_message(msg_id: str, service: Any) -> Dict[str, Any]:
             
         return parsed_data
     except Exception as e:
-        logger.error(f"Error parsing message {msg_id}: {str(e)}")
+        logger.error(f"Error parsing message {msg.get('id')}: {str(e)}")
         return {}
 
 def fetch_transaction_messages(service: Any, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
@@ -324,6 +315,8 @@ def main():
     
     # Get all template names
     all_templates = get_all_template_names()
+    # One parser for the whole run
+    transaction_parser = TransactionParser()
     logger.info(f"Looking for examples of {len(all_templates)} templates")
     
     # Track found templates and failures
@@ -373,8 +366,8 @@ def main():
                 from_address = headers.get('From', '')
                 subject = headers.get('Subject', '')
                 
-                # Parse with TransactionParser
-                parsed_data = parse_message(msg_id, service)
+                # Parse the message fetched above with TransactionParser
+                parsed_data = parse_message(raw_msg, transaction_parser)
                 template_name = parsed_data.get("template_used")
                 
                 sanitized_message = sanitize_for_python(raw_msg)
@@ -14,8 +14,11 @@ from datetime import datetime, timedelta
 import tempfile
 import joblib
 import json
+from contextlib import ExitStack, contextmanager
+from functools import cached_property
 from unittest.mock import Mock, patch, MagicMock
 from typing import Dict, List, Any
+from google.cloud import aiplatform, bigquery, firestore, storage
 
 # Import our components
 from src.models.transaction_trainer import TransactionModelTrainer, extract_vendor_features
@@ -32,51 +35,91 @@ class MLIntegrationTester:
         self.project_id = "test-project"
         self.test_data = None
         self.trained_model = None
+        self._pred_cache = {}
+        
+        # Mock GCP clients shared by every component test; specs limit each mock
+        # to the real client's attributes instead of inventing children on demand
+        self._mock_storage = MagicMock(spec=storage.Client)
+        self._mock_fs = MagicMock(spec=firestore.Client)
+        self._mock_bq = MagicMock(spec=bigquery.Client)
+        self._mock_aiplatform = MagicMock(spec=aiplatform)
+        
+    @contextmanager
+    def mock_gcp_clients(self):
+        """Patch the GCP client constructors once for the whole test run"""
+        with ExitStack() as stack:
+            stack.enter_context(patch('google.cloud.storage.Client', return_value=self._mock_storage))
+            stack.enter_context(patch('google.cloud.firestore.Client', return_value=self._mock_fs))
+            stack.enter_context(patch('google.cloud.bigquery.Client', return_value=self._mock_bq))
+            stack.enter_context(patch('google.cloud.aiplatform', self._mock_aiplatform))
+            yield
+        
+    def predict(self, X):
+        """Predict with the trained model, reusing results for the same input frame"""
+        # Entries keep a reference to X so its id cannot be reused while cached
+        cached = self._pred_cache.get(id(X))
+        if cached is None or cached[0] is not X:
+            cached = (X, self.trained_model.predict(X))
+            self._pred_cache[id(X)] = cached
+        return cached[1]
+        
+    @cached_property
+    def fe(self):
+        """FeatureEngineer shared across test methods (built on first access)"""
+        return FeatureEngineer(self.project_id)
         
     def setup_test_data(self):
         """Load or generate test data"""
         print("=== Setting Up Test Data ===")
         
-        # Try to load existing test data
-        if os.path.exists('test_data/sample_transactions.csv'):
+        csv_path = 'test_data/sample_transactions.csv'
+        # Written only by this tester, from the CSV; the generator's own Parquet
+        # copy has a different (categorical) schema
+        parquet_path = 'test_data/sample_transactions_cache.parquet'
+        
+        # Prefer the Parquet cache (typed columns, no text parsing) unless the CSV is newer
+        if os.path.exists(parquet_path) and (
+                not os.path.exists(csv_path) or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)):
+            print("Loading cached test data...")
+            self.test_data = pd.read_parquet(parquet_path)
+        elif os.path.exists(csv_path):
             print("Loading existing test data...")
-            self.test_data = pd.read_csv('test_data/sample_transactions.csv')
+            self.test_data = pd.read_csv(csv_path)
             self.test_data['date'] = pd.to_datetime(self.test_data['date'])
+            try:
+                self.test_data.to_parquet(parquet_path, index=False)
+            except Exception as e:
+                print(f"Could not cache test data as Parquet: {e}")
         else:
             print("Generating new test data...")
             from scripts.test_trained_models_locally import LocalMLTester
             tester = LocalMLTester()
             self.test_data = tester.generate_sample_data(n_samples=1000)
             
+        # Sample records shared by the component tests (read-only)
+        self._sample_row = self.test_data.iloc[0].to_dict()
+        self._sample_batch10 = self.test_data.head(10).to_dict('records')
+        self._sample_batch2 = self._sample_batch10[:2]
+            
         print(f"Loaded {len(self.test_data)} transactions")
         return self.test_data
     
-    @patch('google.cloud.storage.Client')
-    @patch('google.cloud.firestore.Client')
-    @patch('google.cloud.bigquery.Client')
-    def test_data_export_service(self, mock_bq, mock_fs, mock_storage):
+    def test_data_export_service(self):
         """Test DataExportService"""
         print("\n=== Testing DataExportService ===")
         
         # Mock BigQuery client
-        mock_bq_instance = MagicMock()
-        mock_bq.return_value = mock_bq_instance
+        mock_bq_instance = self._mock_bq
         
         # Mock query results
-        mock_query_job = MagicMock()
+        mock_query_job = MagicMock(spec=bigquery.QueryJob)
         mock_query_job.result.return_value = None
         mock_query_job.job_id = "test-job-123"
         mock_bq_instance.query.return_value = mock_query_job
         
         # Mock Storage client
-        mock_storage_instance = MagicMock()
-        mock_storage.return_value = mock_storage_instance
-        mock_bucket = MagicMock()
-        mock_storage_instance.bucket.return_value = mock_bucket
-        
-        # Mock Firestore
-        mock_fs_instance = MagicMock()
-        mock_fs.return_value = mock_fs_instance
+        mock_bucket = MagicMock(spec=storage.Bucket)
+        self._mock_storage.bucket.return_value = mock_bucket
         
         # Create service
         service = DataExportService(self.project_id)
@@ -94,25 +137,20 @@ class MLIntegrationTester:
         
         return True
     
-    @patch('google.cloud.storage.Client')
-    def test_feature_engineering(self, mock_storage):
+    def test_feature_engineering(self):
         """Test FeatureEngineer"""
         print("\n=== Testing FeatureEngineer ===")
         
-        # Mock storage
-        mock_storage_instance = MagicMock()
-        mock_storage.return_value = mock_storage_instance
-        
         # Create feature engineer
-        fe = FeatureEngineer(self.project_id)
+        fe = self.fe
         
         # Test single transaction
-        sample = self.test_data.iloc[0].to_dict()
+        sample = self._sample_row
         features = fe.transform_transaction(sample)
         print(f"✓ Single transaction: {features.shape}")
         
         # Test batch
-        batch = self.test_data.head(10).to_dict('records')
+        batch = self._sample_batch10
         batch_features = fe.transform_transactions(batch)
         print(f"✓ Batch transformation: {batch_features.shape}")
         
@@ -122,20 +160,16 @@ class MLIntegrationTester:
         
         return fe
     
-    @patch('google.cloud.aiplatform')
-    @patch('google.cloud.storage.Client')
-    def test_model_training(self, mock_storage, mock_aiplatform):
+    def test_model_training(self):
         """Test model training process"""
         print("\n=== Testing Model Training ===")
         
         # Mock storage
-        mock_storage_instance = MagicMock()
-        mock_storage.return_value = mock_storage_instance
-        mock_bucket = MagicMock()
-        mock_storage_instance.bucket.return_value = mock_bucket
+        mock_bucket = MagicMock(spec=storage.Bucket)
+        self._mock_storage.bucket.return_value = mock_bucket
         
         # Mock Vertex AI
-        mock_aiplatform.init.return_value = None
+        self._mock_aiplatform.init.return_value = None
         
         # Create trainer
         trainer = TransactionModelTrainer(self.project_id)
@@ -146,7 +180,8 @@ class MLIntegrationTester:
         # Test data preparation
         train_df, test_df, sample_weights = trainer.prepare_training_data(self.test_data)
         print(f"✓ Data split: train={len(train_df)}, test={len(test_df)}")
-        print(f"✓ sample_weights: user_corrected={sample_weights[self.test_data['is_user_corrected']].mean():.1f}")
+        corrected = train_df['is_user_corrected'].to_numpy(dtype=bool)
+        print(f"✓ sample_weights: user_corrected={sample_weights.to_numpy()[corrected].mean():.1f}")
         
         # Test pipeline creation
         pipeline = trainer.create_pipeline()
@@ -155,8 +190,21 @@ class MLIntegrationTester:
         # Train locally
         print("\nTraining model locally...")
          # Apply vendor feature extraction before training
-        train_df = extract_vendor_features(train_df.copy())
-        test_df = extract_vendor_features(test_df.copy())
+        # One call for both splits: only the vendor columns are stacked, and the
+        # flags are joined back onto each split without copying its other columns
+        n_train = len(train_df)
+        vendor_df = extract_vendor_features(
+            pd.concat([train_df[['vendor']], test_df[['vendor']]], ignore_index=True)
+        )
+        
+        def with_vendor_features(df, features):
+            features = features.set_axis(df.index)
+            result = pd.concat([df, features.drop(columns='vendor')], axis=1, copy=False)
+            result['vendor'] = features['vendor']
+            return result
+        
+        train_df = with_vendor_features(train_df, vendor_df.iloc[:n_train])
+        test_df = with_vendor_features(test_df, vendor_df.iloc[n_train:])
         
         # Prepare features and labels - include vendor features
         text_columns = ['vendor', 'vendor_cleaned', 'cleaned_metaphone',
@@ -168,50 +216,50 @@ class MLIntegrationTester:
         
         # Combine all features
         feature_columns = text_columns + vendor_features
-        # Convert text features to string to avoid TfidfVectorizer errors
-        X_train = train_df[feature_columns].copy()
-        for col in text_columns:
-            X_train[col] = X_train[col].astype(str)
         
+        # Build feature frames straight from columns (one allocation per column).
+        # Text features are converted to Arrow-backed strings to avoid TfidfVectorizer
+        # errors: one contiguous buffer per column instead of a Python object per cell.
+        # Missing values are filled with 'nan' so TfidfVectorizer never sees NA.
+        def feature_frame(df):
+            return pd.DataFrame(
+                {col: (df[col].astype('string[pyarrow]').fillna('nan') if col in text_columns
+                       else df[col].to_numpy(copy=False))
+                 for col in feature_columns},
+                index=df.index
+            )
+        
+        X_train = feature_frame(train_df)
         y_train = train_df[['category', 'subcategory']].astype('string')
         
-        X_test = test_df[feature_columns].copy()
-        for col in text_columns:
-            X_test[col] = X_test[col].astype(str)
-        
+        X_test = feature_frame(test_df)
         y_test = test_df[['category', 'subcategory']].astype('string')
         
         # Train the model with sample weights
         pipeline.fit(X_train, y_train, multi_target_classifier__sample_weight=sample_weights)
         self.trained_model = pipeline
+        self._pred_cache.clear()
         print("✓ Model trained successfully")
         
         # Evaluate the model
-        self.logger.info("Evaluating model...")
-        predictions = pipeline.predict(X_test)
+        print("Evaluating model...")
+        predictions = self.predict(X_test)
         print(f"✓ Test predictions shape: {predictions.shape}")
         
         return pipeline
     
-    @patch('google.cloud.aiplatform')
-    @patch('google.cloud.storage.Client')
-    @patch('google.cloud.firestore.Client')
-    def test_prediction_service(self, mock_fs, mock_storage, mock_aiplatform):
+    def test_prediction_service(self):
         """Test ML prediction service"""
         print("\n=== Testing ML Prediction Service ===")
         
-        # Mock clients
-        mock_storage.return_value = MagicMock()
-        mock_fs_instance = MagicMock()
-        mock_fs.return_value = mock_fs_instance
-        
         # Mock Vertex AI
+        mock_aiplatform = self._mock_aiplatform
         mock_aiplatform.init.return_value = None
-        mock_endpoint = MagicMock()
+        mock_endpoint = MagicMock(spec=aiplatform.Endpoint)
         mock_aiplatform.Endpoint.return_value = mock_endpoint
         
         # Mock model list
-        mock_model = MagicMock()
+        mock_model = MagicMock(spec=aiplatform.Model)
         mock_model.display_name = "transaction_model_v1"
         mock_model.resource_name = "projects/test/models/123"
         mock_aiplatform.Model.list.return_value = [mock_model]
@@ -224,7 +272,7 @@ class MLIntegrationTester:
         service.model_version = "transaction_model_v1"
         
         # Mock prediction response
-        mock_response = MagicMock()
+        mock_response = MagicMock(spec=aiplatform.models.Prediction)
         mock_response.predictions = [
             ["Food & Dining", "Restaurants"],
             ["Shopping", "General Merchandise"]
@@ -232,12 +280,12 @@ class MLIntegrationTester:
         mock_endpoint.predict.return_value = mock_response
         
         # Test single prediction
-        transaction = self.test_data.iloc[0].to_dict()
+        transaction = self._sample_row
         result = service.predict_category(transaction)
         print(f"✓ Single prediction: {result['category']}")
         
         # Test batch prediction
-        transactions = self.test_data.head(2).to_dict('records')
+        transactions = self._sample_batch2
         results = service.predict_categories(transactions)
         print(f"✓ Batch predictions: {len(results)} results")
         
@@ -247,28 +295,21 @@ class MLIntegrationTester:
         
         return service
     
-    @patch('google.cloud.bigquery.Client')
-    @patch('google.cloud.firestore.Client')
-    def test_feedback_service(self, mock_fs, mock_bq):
+    def test_feedback_service(self):
         """Test ML feedback service"""
         print("\n=== Testing ML Feedback Service ===")
         
         # Mock BigQuery
-        mock_bq_instance = MagicMock()
-        mock_bq.return_value = mock_bq_instance
-        mock_table = MagicMock()
+        mock_bq_instance = self._mock_bq
+        mock_table = MagicMock(spec=bigquery.Table)
         mock_bq_instance.create_table.return_value = mock_table
         mock_bq_instance.insert_rows_json.return_value = []
         
-        # Mock Firestore
-        mock_fs_instance = MagicMock()
-        mock_fs.return_value = mock_fs_instance
-        
         # Create service
         service = MLFeedbackService(self.project_id)
         
         # Test feedback recording
-        transaction = self.test_data.iloc[0].to_dict()
+        transaction = self._sample_row
         success = service.record_feedback(
             transaction_id="txn_001",
             user_id="user_001",
@@ -283,7 +324,7 @@ class MLIntegrationTester:
         print(f"✓ Feedback recorded: {success}")
         
         # Mock stats query
-        mock_query_job = MagicMock()
+        mock_query_job = MagicMock(spec=bigquery.QueryJob)
         mock_result = MagicMock()
         mock_result.total_feedback = 100
         mock_result.unique_users = 10
@@ -321,7 +362,7 @@ class MLIntegrationTester:
         
         # Feature engineering
         print("\n2. Feature engineering:")
-        fe = FeatureEngineer(self.project_id)
+        fe = self.fe
         features = fe.transform_transaction(transaction)
         print(f"   Generated {len(features.columns)} features")
         
@@ -389,14 +430,16 @@ def main():
     # Setup test data
     tester.setup_test_data()
     
-    # Run component tests
+    # Run component tests one at a time: they reconfigure the same storage and
+    # BigQuery mocks and share the tester's FeatureEngineer
     try:
-        tester.test_data_export_service()
-        tester.test_feature_engineering()
-        tester.test_model_training()
-        tester.test_prediction_service()
-        tester.test_feedback_service()
-        tester.test_end_to_end_flow()
+        with tester.mock_gcp_clients():
+            tester.test_data_export_service()
+            tester.test_feature_engineering()
+            tester.test_model_training()
+            tester.test_prediction_service()
+            tester.test_feedback_service()
+            tester.test_end_to_end_flow()
         
         # Generate report
         tester.generate_test_report()
@@ -1,27 +1,33 @@
-import joblib
-from google.cloud import storage
-import tempfile
+"""Download the trained model from GCS and confirm it deserializes."""
 
 # Specify project ID as in TransactionModelTrainer
 project_id = 'shanedancy-9f2a3'
 
-# Initialize GCS client with explicit project ID for proper authentication
-client = storage.Client(project=project_id)
-
 # Specify bucket and blob path from context
 bucket_name = 'shanedancy-9f2a3-ml-artifacts'
 blob_path = 'models/transaction_model_v20250727/model.joblib'  # Using 'model.joblib' as per training script upload
 
-# Download to temporary file
-bucket = client.bucket(bucket_name)
-blob = bucket.blob(blob_path)
 
-with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-    blob.download_to_filename(temp_file.name)
-    loaded = joblib.load(temp_file.name)
+def main():
+    # Heavy imports live here so importing this module stays cheap
+    import io
+    import joblib
+    from google.cloud import storage
+
+    # Initialize GCS client with explicit project ID for proper authentication
+    client = storage.Client(project=project_id)
+
+    # Download into memory and deserialize from the buffer (no temp file round trip).
+    # joblib is kept rather than pickle: it detects compression itself, and even
+    # uncompressed joblib files store numpy arrays outside the plain pickle stream.
+    bucket = client.bucket(bucket_name)
+    blob = bucket.blob(blob_path)
+
+    buffer = io.BytesIO(blob.download_as_bytes())
+    loaded = joblib.load(buffer)
+
+    print(type(loaded))
 
-# Clean up temp file (optional, but good practice)
-import os
-os.unlink(temp_file.name)
 
-print(type(loaded))
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -6,32 +6,53 @@ Tests existing transaction categorization models (pickle files) without requirin
 
 import sys
 import os
+import re
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Mock Google Cloud services before importing any modules that use them
 from unittest.mock import Mock, MagicMock, patch
 
-# Create mock modules for Google Cloud services
-sys.modules['google.cloud.storage'] = MagicMock()
-sys.modules['google.cloud.aiplatform'] = MagicMock()
-sys.modules['google.cloud.bigquery'] = MagicMock()
-sys.modules['google.cloud.firestore'] = MagicMock()
-sys.modules['google.cloud.monitoring'] = MagicMock()
-sys.modules['google.cloud.monitoring_dashboard'] = MagicMock()
-
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix
 import joblib
 import json
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Union
+
+# Google Cloud service modules replaced by mocks while our ML components are imported
+_GCP_MODULES = (
+    'google.cloud.storage', 'google.cloud.aiplatform', 'google.cloud.bigquery',
+    'google.cloud.firestore', 'google.cloud.monitoring', 'google.cloud.monitoring_dashboard'
+)
+
+
+def mock_gcp_modules():
+    """Mock the Google Cloud modules in sys.modules, restoring them when the context exits"""
+    return patch.dict(sys.modules, {name: MagicMock() for name in _GCP_MODULES})
+
 
 # Now import our ML components (with mocked GCP services)
-from src.models.transaction_trainer import TransactionModelTrainer, extract_vendor_features
-from src.services.feature_engineering import FeatureEngineer
+with mock_gcp_modules():
+    from src.models.transaction_trainer import TransactionModelTrainer, VENDOR_PATTERNS, extract_vendor_features
+    from src.services.feature_engineering import FeatureEngineer
+
+# Model input columns in the exact order expected by the model (same as production):
+# text columns first, then one column per vendor feature in first-seen pattern order
+_TEXT_COLUMNS = ('vendor', 'vendor_cleaned', 'cleaned_metaphone',
+                 'template_used', 'account', 'day', 'month', 'year', 'day_name')
+_VENDOR_FEATURE_COLUMNS = tuple(dict.fromkeys(name for _, name in VENDOR_PATTERNS))
+_ALL_COLUMNS = _TEXT_COLUMNS + _VENDOR_FEATURE_COLUMNS
+# Text columns as str for the TF-IDF vectorizers, vendor features as int (same as production)
+_COLUMN_DTYPES = {**{col: str for col in _TEXT_COLUMNS}, **{col: int for col in _VENDOR_FEATURE_COLUMNS}}
+
+# Simple phonetic reductions for the metaphone simulation, applied in one regex pass
+# ('qur'/'quh' fold in the wr/wh reductions that 'qu' -> 'kw' would otherwise set up)
+_METAPHONE_MAP = {
+    'ph': 'f', 'ck': 'k', 'qur': 'kr', 'quh': 'kw', 'qu': 'kw', 'x': 'ks',
+    'wr': 'r', 'wh': 'w', 'gh': 'g'
+}
+_METAPHONE_PATTERN = re.compile('|'.join(_METAPHONE_MAP))
 
 
 class MockFeatureEngineer:
@@ -48,24 +69,30 @@ class MockFeatureEngineer:
         """Transform single transaction (simplified)"""
         df = pd.DataFrame([transaction])
         # Add computed features
-        if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'])
-            df['day'] = df['date'].dt.day
-            df['month'] = df['date'].dt.month
-            df['year'] = df['date'].dt.year
-            df['day_name'] = df['date'].dt.day_name()
+        self._add_date_features(df)
+        return df[self.feature_columns]
+    
+    def transform_transactions(self, transactions: Union[List[Dict[str, Any]], pd.DataFrame]) -> pd.DataFrame:
+        """Transform multiple transactions (records or an existing DataFrame)"""
+        if isinstance(transactions, pd.DataFrame):
+            # Frames that already carry the date features need no further work
+            if all(col in transactions.columns for col in ('day', 'month', 'year', 'day_name')):
+                return transactions[self.feature_columns]
+            df = transactions.copy()
+        else:
+            df = pd.DataFrame(transactions)
+        self._add_date_features(df)
         return df[self.feature_columns]
     
-    def transform_transactions(self, transactions: List[Dict[str, Any]]) -> pd.DataFrame:
-        """Transform multiple transactions"""
-        df = pd.DataFrame(transactions)
+    def _add_date_features(self, df: pd.DataFrame):
+        """Add date components in place, keeping a day_name the input already has"""
         if 'date' in df.columns:
             df['date'] = pd.to_datetime(df['date'])
             df['day'] = df['date'].dt.day
             df['month'] = df['date'].dt.month
             df['year'] = df['date'].dt.year
-            df['day_name'] = df['date'].dt.day_name()
-        return df[self.feature_columns]
+            if 'day_name' not in df.columns:
+                df['day_name'] = df['date'].dt.day_name()
     
     def validate_transaction_data(self, transaction: Dict[str, Any]) -> tuple:
         """Validate transaction data"""
@@ -110,73 +137,89 @@ class LocalMLTester:
             'cvs': ('Healthcare', 'Pharmacy'),
             'att': ('Bills & Utilities', 'Phone')
         }
+        
+        # Seeded generator so sample data is reproducible between runs
+        self._rng = np.random.default_rng(seed=42)
+        
+        # Lookup tables for vectorized sample generation
+        self._vendor_category_idx = np.array(
+            [self.categories.index(cat) for cat, _ in self.vendor_mappings.values()])
+        self._other_categories = np.array(
+            [[c for c in self.categories if c != cat] for cat in self.categories], dtype=object)
+        self._subcategory_options = {
+            cat: np.array(subs, dtype=object) for cat, subs in self.subcategories.items()
+        }
     
     def generate_sample_data(self, n_samples: int = 1000) -> pd.DataFrame:
         """Generate synthetic transaction data for testing"""
         print(f"Generating {n_samples} sample transactions...")
         
-        data = []
-        vendors = list(self.vendor_mappings.keys())
-        accounts = ['Checking', 'Credit Card', 'Savings']
-        templates = ['BANK_TEMPLATE_A', 'BANK_TEMPLATE_B', 'CREDIT_CARD_TEMPLATE']
-        
-        for i in range(n_samples):
-            # Random vendor
-            vendor = random.choice(vendors)
-            category, subcategory = self.vendor_mappings[vendor]
-            
-            # Add some noise - 10% misclassified initially
-            if random.random() < 0.1:
-                category = random.choice([c for c in self.categories if c != category])
-                subcategory = random.choice(self.subcategories[category])
-            
-            # Random amount based on category
-            if category == 'Income':
-                amount = round(random.uniform(1000, 5000), 2)
-            elif category == 'Bills & Utilities':
-                amount = round(random.uniform(50, 300), 2)
-            else:
-                amount = round(random.uniform(5, 200), 2)
-            
-            # Random date in last 180 days
-            date = datetime.now() - timedelta(days=random.randint(0, 180))
-            
-            # Create transaction
-            transaction = {
-                'transaction_id': f'txn_{i:06d}',
-                'user_id': f'user_{random.randint(1, 10):03d}',
-                'vendor': f"{vendor.upper()} #{random.randint(1000, 9999)}",
-                'vendor_cleaned': vendor,
-                'cleaned_metaphone': self._get_metaphone(vendor),
-                'amount': amount,
-                'account': random.choice(accounts),
-                'template_used': random.choice(templates),
-                'date': date,
-                'day': date.day,
-                'month': date.month,
-                'year': date.year,
-                'day_name': date.strftime('%A'),
-                'category': category,
-                'subcategory': subcategory,
-                'is_user_corrected': random.random() < 0.2  # 20% user corrections
-            }
-            
-            data.append(transaction)
-        
-        df = pd.DataFrame(data)
+        rng = self._rng
+        vendors = np.array(list(self.vendor_mappings.keys()), dtype=object)
+        accounts = np.array(['Checking', 'Credit Card', 'Savings'], dtype=object)
+        templates = np.array(['BANK_TEMPLATE_A', 'BANK_TEMPLATE_B', 'CREDIT_CARD_TEMPLATE'], dtype=object)
+        
+        # Random vendor
+        vendor_idx = rng.integers(0, len(vendors), n_samples)
+        vendor = vendors[vendor_idx]
+        # Metaphone only depends on the vendor, so compute it once per vendor
+        metaphones = np.array([self._get_metaphone(v) for v in vendors], dtype=object)
+        mapped = np.array(list(self.vendor_mappings.values()), dtype=object)
+        category = mapped[vendor_idx, 0]
+        subcategory = mapped[vendor_idx, 1]
+        
+        # Add some noise - 10% misclassified initially
+        noise_mask = rng.random(n_samples) < 0.1
+        other_idx = rng.integers(0, self._other_categories.shape[1], n_samples)
+        other_category = self._other_categories[self._vendor_category_idx[vendor_idx], other_idx]
+        category = np.where(noise_mask, other_category, category)
+        for cat, subs in self._subcategory_options.items():
+            rows = noise_mask & (category == cat)
+            subcategory[rows] = rng.choice(subs, rows.sum())
+        
+        # Random amount based on category
+        amount = np.select(
+            [category == 'Income', category == 'Bills & Utilities'],
+            [rng.uniform(1000, 5000, n_samples), rng.uniform(50, 300, n_samples)],
+            rng.uniform(5, 200, n_samples)
+        ).round(2)
+        
+        # Random date in last 180 days
+        days_ago = rng.integers(0, 181, n_samples).astype('timedelta64[D]')
+        dates = pd.DatetimeIndex(np.datetime64(datetime.now()) - days_ago)
+        
+        # Build each column as an array and create the frame in one call
+        df = pd.DataFrame({
+            'transaction_id': np.char.add('txn_', np.char.zfill(np.arange(n_samples).astype(str), 6)),
+            'user_id': np.char.add('user_', np.char.zfill(rng.integers(1, 11, n_samples).astype(str), 3)),
+            'vendor': np.char.add(np.char.upper(vendor.astype(str)),
+                                  np.char.add(' #', rng.integers(1000, 10000, n_samples).astype(str))),
+            'vendor_cleaned': vendor,
+            'cleaned_metaphone': metaphones[vendor_idx],
+            'amount': amount,
+            'account': accounts[rng.integers(0, len(accounts), n_samples)],
+            'template_used': templates[rng.integers(0, len(templates), n_samples)],
+            'date': dates,
+            'day': dates.day.to_numpy(dtype=np.uint8),
+            'month': dates.month.to_numpy(dtype=np.uint8),
+            'year': dates.year.to_numpy(dtype=np.uint16),
+            'day_name': dates.day_name(),
+            'category': category,
+            'subcategory': subcategory,
+            'is_user_corrected': rng.random(n_samples) < 0.2  # 20% user corrections
+        })
+        
+        # Low-cardinality strings as categoricals and compact numeric types
+        for col in ['vendor_cleaned', 'account', 'template_used', 'day_name',
+                    'category', 'subcategory', 'cleaned_metaphone']:
+            df[col] = df[col].astype('category')
+        df['amount'] = pd.to_numeric(df['amount'], downcast='float')
         print(f"Generated {len(df)} transactions with {df['category'].nunique()} categories")
         return df
     
     def _get_metaphone(self, text: str) -> str:
         """Simple metaphone simulation"""
-        # Simple phonetic reduction for testing
-        replacements = {
-            'ph': 'f', 'ck': 'k', 'qu': 'kw', 'x': 'ks',
-            'wr': 'r', 'wh': 'w', 'gh': 'g'
-        }
-        result = text.lower()
-        for old, new in replacements.items():
-            result = result.replace(old, new)
+        result = _METAPHONE_PATTERN.sub(lambda m: _METAPHONE_MAP[m.group(0)], text.lower())
         return result.upper()[:6]
     
     def test_feature_engineering(self, df: pd.DataFrame):
@@ -195,7 +238,7 @@ class LocalMLTester:
         print(f"Feature names: {list(features.columns)[:10]}...")
         
         # Test batch transformation
-        batch_features = fe.transform_transactions(df.head(10).to_dict('records'))
+        batch_features = fe.transform_transactions(df.head(10))
         print(f"\nBatch transformation: {batch_features.shape}")
         
         # Test validation
@@ -242,13 +285,13 @@ class LocalMLTester:
         predictions = model.predict(X_test)
         
         # Display results
-        for i, (idx, transaction) in enumerate(test_samples.iterrows()):
-            print(f"\nVendor: {transaction['vendor']}")
-            print(f"Amount: ${transaction['amount']:.2f}")
-            print(f"Account: {transaction['account']}")
-            print(f"Actual category: {transaction['category']}")
+        for i, transaction in enumerate(test_samples.itertuples(index=False)):
+            print(f"\nVendor: {transaction.vendor}")
+            print(f"Amount: ${transaction.amount:.2f}")
+            print(f"Account: {transaction.account}")
+            print(f"Actual category: {transaction.category}")
             print(f"Predicted category: {predictions[i]}")
-            print(f"Match: {'✓' if predictions[i] == transaction['category'] else '✗'}")
+            print(f"Match: {'✓' if predictions[i] == transaction.category else '✗'}")
     
     def test_saved_pickle_model(self, pickle_path: str, test_transactions: List[Dict[str, Any]] = None):
         """Test a saved pickle model file with production-like feature engineering"""
@@ -256,8 +299,7 @@ class LocalMLTester:
         
         # Load the model
         try:
-            with open(pickle_path, 'rb') as f:
-                model = joblib.load(f)
+            model = joblib.load(pickle_path)
             print(f"✓ Successfully loaded model from {pickle_path}")
         except Exception as e:
             print(f"✗ Failed to load model: {e}")
@@ -312,7 +354,7 @@ class LocalMLTester:
         df = pd.DataFrame(test_transactions)
         
         # Apply vendor feature extraction (same as production)
-        df = extract_vendor_features(df.copy())
+        df = extract_vendor_features(df)
         
         # Extract date features (same as production FeatureEngineer)
         df['date'] = pd.to_datetime(df['date'])
@@ -322,20 +364,9 @@ class LocalMLTester:
         df['day_name'] = df['date'].dt.day_name()
         
         # Prepare features in the exact order expected by the model (same as production)
-        text_columns = ['vendor', 'vendor_cleaned', 'cleaned_metaphone',
-                       'template_used', 'account', 'day', 'month', 'year', 'day_name']
-        # Use the same vendor patterns as production
-        vendor_patterns = [
-            ('amz', 'amazon'), ('a.mazon', 'amazon'), ('amazon', 'amazon'),
-            ('aramark', 'aramark'), ('jpmc', 'aramark'),
-            ('great clips', 'great_clips'), ('osu', 'ohio_state'), ('ohio state', 'ohio_state'),
-            ('firstma', 'student_loan'), ('mohela', 'student_loan'),
-            ('spirits', 'bar'), ('brewery', 'bar'), ('tavern', 'bar'), ('bar', 'bar'),
-            ('supplement', 'supplements'), ('best buy', 'best_buy'), ('lending', 'loan')
-        ]
-        vendor_feature_columns = list(set([pattern[1] for pattern in vendor_patterns]))
-        
-        all_columns = text_columns + vendor_feature_columns
+        text_columns = list(_TEXT_COLUMNS)
+        vendor_feature_columns = list(_VENDOR_FEATURE_COLUMNS)
+        all_columns = list(_ALL_COLUMNS)
         
         # Ensure all columns exist (same as production)
         for col in all_columns:
@@ -346,49 +377,38 @@ class LocalMLTester:
                     df[col] = ''  # Default text features to empty string
         
         # Select features in correct order
-        X = df[all_columns].copy()
-        
-        # Convert text columns to string (same as production)
-        for col in text_columns:
-            X[col] = X[col].astype(str)
-        
-        # Convert numeric columns to proper type (same as production)
-        for col in vendor_feature_columns:
-            X[col] = X[col].astype(int)
+        # and convert text/numeric columns in one pass (same as production)
+        X = df[all_columns].astype(_COLUMN_DTYPES)
         
         try:
             # Make predictions
             predictions = model.predict(X)
             
             print("\n=== Predictions (Production-like Format) ===")
-            for i, transaction in enumerate(test_transactions):
-                # Format prediction like production ML service
-                if hasattr(model, 'named_steps') and 'multi_target_classifier' in model.named_steps:
-                    # Multi-output model (production format)
-                    category = predictions[i][0] if len(predictions[i]) > 0 else 'Unknown'
-                    subcategory = predictions[i][1] if len(predictions[i]) > 1 else 'Unknown'
-                else:
-                    # Single-output model (fallback)
-                    category = predictions[i] if isinstance(predictions[i], str) else str(predictions[i])
-                    subcategory = 'Unknown'
-                
-                # Create production-like result format
-                result = {
-                    'category': category,
-                    'subcategory': subcategory,
-                    'confidence': 0.85,  # Mock confidence
-                    'model_version': os.path.basename(pickle_path),
-                    'predicted_at': datetime.now().isoformat()
-                }
-                
-                print(f"\nTransaction {i+1}:")
-                print(f"  Vendor: {transaction['vendor']}")
-                print(f"  Amount: ${transaction['amount']:.2f}")
-                print(f"  Date: {transaction['date']}")
-                print(f"  Predicted Category: {result['category']}")
-                print(f"  Predicted Subcategory: {result['subcategory']}")
-                print(f"  Confidence: {result['confidence']:.2f}")
-                print(f"  Model Version: {result['model_version']}")
+            # Format predictions like production ML service
+            if hasattr(model, 'named_steps') and 'multi_target_classifier' in model.named_steps:
+                # Multi-output model (production format)
+                categories = [p[0] if len(p) > 0 else 'Unknown' for p in predictions]
+                subcategories = [p[1] if len(p) > 1 else 'Unknown' for p in predictions]
+            else:
+                # Single-output model (fallback)
+                categories = [p if isinstance(p, str) else str(p) for p in predictions]
+                subcategories = ['Unknown'] * len(predictions)
+            
+            # Collect production-like results and print them as one table
+            results = pd.DataFrame({
+                'vendor': [t['vendor'] for t in test_transactions],
+                'amount': [t['amount'] for t in test_transactions],
+                'date': [t['date'] for t in test_transactions],
+                'category': categories,
+                'subcategory': subcategories,
+                'confidence': 0.85,  # Mock confidence
+                'model_version': os.path.basename(pickle_path)
+            })
+            print(results.to_string(index=False, formatters={
+                'amount': '${:.2f}'.format,
+                'confidence': '{:.2f}'.format
+            }))
             
             print("\n✓ Model predictions completed successfully!")
             
@@ -423,8 +443,7 @@ class LocalMLTester:
         
         # Load the model
         try:
-            with open(pickle_path, 'rb') as f:
-                model = joblib.load(f)
+            model = joblib.load(pickle_path)
             print(f"✓ Successfully loaded model from {pickle_path}")
         except Exception as e:
             print(f"✗ Failed to load model: {e}")
@@ -457,7 +476,7 @@ class LocalMLTester:
         df = pd.DataFrame(test_transactions)
         
         # Step 2: Apply vendor feature extraction (same as production)
-        df = extract_vendor_features(df.copy())
+        df = extract_vendor_features(df)
         print(f"✓ Applied vendor feature extraction")
         
         # Step 3: Extract date features (same as production)
@@ -469,20 +488,9 @@ class LocalMLTester:
         print(f"✓ Extracted date features")
         
         # Step 4: Prepare features in exact production order
-        text_columns = ['vendor', 'vendor_cleaned', 'cleaned_metaphone',
-                       'template_used', 'account', 'day', 'month', 'year', 'day_name']
-        # Use the same vendor patterns as production
-        vendor_patterns = [
-            ('amz', 'amazon'), ('a.mazon', 'amazon'), ('amazon', 'amazon'),
-            ('aramark', 'aramark'), ('jpmc', 'aramark'),
-            ('great clips', 'great_clips'), ('osu', 'ohio_state'), ('ohio state', 'ohio_state'),
-            ('firstma', 'student_loan'), ('mohela', 'student_loan'),
-            ('spirits', 'bar'), ('brewery', 'bar'), ('tavern', 'bar'), ('bar', 'bar'),
-            ('supplement', 'supplements'), ('best buy', 'best_buy'), ('lending', 'loan')
-        ]
-        vendor_feature_columns = list(set([pattern[1] for pattern in vendor_patterns]))
-        
-        all_columns = text_columns + vendor_feature_columns
+        text_columns = list(_TEXT_COLUMNS)
+        vendor_feature_columns = list(_VENDOR_FEATURE_COLUMNS)
+        all_columns = list(_ALL_COLUMNS)
         
         # Step 5: Ensure all columns exist (same as production)
         for col in all_columns:
@@ -493,18 +501,12 @@ class LocalMLTester:
                     df[col] = ''  # Default text features to empty string
         
         # Step 6: Select columns in exact order
-        features_df = df[all_columns].copy()
-        
-        # Step 7: Convert text columns to string (same as production)
-        for col in text_columns:
-            features_df[col] = features_df[col].astype(str)
-        
-        # Step 8: Convert numeric columns to proper type (same as production)
-        for col in vendor_feature_columns:
-            features_df[col] = features_df[col].astype(int)
+        # Step 7: Convert text and numeric columns in one pass (same as production)
+        features_df = df[all_columns].astype(_COLUMN_DTYPES)
         
-        # Step 9: Convert to list of lists (same as production)
-        features_list = features_df.values.tolist()
+        # Step 8: Positional 2D input, as the Vertex AI endpoint rebuilds from its
+        # list-of-lists payload (to_numpy avoids boxing every cell into a Python list)
+        features_array = features_df.to_numpy()
         
         print(f"✓ Prepared features in production format")
         print(f"  Text columns: {text_columns}")
@@ -512,9 +514,9 @@ class LocalMLTester:
         print(f"  Total features: {len(all_columns)}")
         print(f"  Input shape: {features_df.shape}")
         
-        # Step 10: Make predictions
+        # Step 9: Make predictions
         try:
-            predictions = model.predict(features_list)
+            predictions = model.predict(features_array)
             
             print("\n--- Production-like Predictions ---")
             for i, transaction in enumerate(test_transactions):
@@ -550,9 +552,11 @@ class LocalMLTester:
         """Generate a test report"""
         print("\n=== Test Report ===")
         print(f"Total transactions: {len(df)}")
-        print(f"Date range: {df['date'].min()} to {df['date'].max()}")
+        date_stats = df['date'].agg(['min', 'max'])
+        correction_stats = df['is_user_corrected'].agg(['sum', 'mean'])
+        print(f"Date range: {date_stats['min']} to {date_stats['max']}")
         print(f"Unique users: {df['user_id'].nunique()}")
-        print(f"User corrections: {df['is_user_corrected'].sum()} ({df['is_user_corrected'].mean():.1%})")
+        print(f"User corrections: {int(correction_stats['sum'])} ({correction_stats['mean']:.1%})")
         
         print("\nCategory distribution:")
         category_dist = df['category'].value_counts()
@@ -571,7 +575,7 @@ class MockLocalTrainer:
     def train_local_model(self, df: pd.DataFrame):
         """Train a simple model locally"""
         from sklearn.ensemble import RandomForestClassifier
-        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.feature_extraction.text import HashingVectorizer
         from sklearn.preprocessing import StandardScaler
         from sklearn.pipeline import Pipeline
         from sklearn.compose import ColumnTransformer
@@ -586,7 +590,8 @@ class MockLocalTrainer:
         text_features = ['vendor_cleaned', 'account', 'template_used']
         
         numeric_transformer = StandardScaler()
-        text_transformer = CountVectorizer(max_features=100)
+        # Stateless hashing: no vocabulary pass at fit time and nothing to store
+        text_transformer = HashingVectorizer(n_features=256, alternate_sign=False, norm=None)
         
         # Note: This is simplified - real model uses TfidfVectorizer and more features
         preprocessor = ColumnTransformer(
@@ -598,7 +603,7 @@ class MockLocalTrainer:
         # Create and train model
         model = Pipeline([
             ('preprocessor', preprocessor),
-            ('classifier', RandomForestClassifier(n_estimators=100, random_state=42))
+            ('classifier', RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1))
         ])
         
         # Train on category only for simplicity
@@ -647,9 +652,11 @@ def main():
     # Generate sample data
     df = tester.generate_sample_data(n_samples=2000)
     
-    # Save sample data for inspection
+    # Save sample data for inspection. The CSV is what train_models_locally.py and
+    # test_ml_integration.py read; the Parquet copy keeps the generated dtypes
     df.to_csv('test_data/sample_transactions.csv', index=False)
-    print(f"\nSample data saved to test_data/sample_transactions.csv")
+    df.to_parquet('test_data/sample_transactions.parquet', compression='snappy', index=False)
+    print(f"\nSample data saved to test_data/sample_transactions.csv and test_data/sample_transactions.parquet")
     
     # Test feature engineering
     tester.test_feature_engineering(df)
@@ -665,15 +672,18 @@ def main():
     
     # Demo real-time prediction
     print("\n=== Real-time Prediction Demo ===")
-    demo_transactions = pd.DataFrame([
-        {'vendor_cleaned': 'amazon', 'amount': 49.99, 'account': 'Credit Card', 'template_used': 'CREDIT_CARD_TEMPLATE'},
-        {'vendor_cleaned': 'starbucks', 'amount': 5.75, 'account': 'Checking', 'template_used': 'BANK_TEMPLATE_A'},
-        {'vendor_cleaned': 'uber', 'amount': 23.50, 'account': 'Credit Card', 'template_used': 'CREDIT_CARD_TEMPLATE'}
-    ])
+    demo_transactions = pd.DataFrame({
+        'vendor_cleaned': ['amazon', 'starbucks', 'uber'],
+        'amount': [49.99, 5.75, 23.50],
+        'account': ['Credit Card', 'Checking', 'Credit Card'],
+        'template_used': ['CREDIT_CARD_TEMPLATE', 'BANK_TEMPLATE_A', 'CREDIT_CARD_TEMPLATE']
+    })
     
     demo_predictions = model.predict(demo_transactions)
-    for i, (_, row) in enumerate(demo_transactions.iterrows()):
-        print(f"\n{row['vendor_cleaned'].upper()} - ${row['amount']:.2f}")
+    vendors = demo_transactions['vendor_cleaned'].to_numpy()
+    amounts = demo_transactions['amount'].to_numpy()
+    for i in range(len(demo_transactions)):
+        print(f"\n{vendors[i].upper()} - ${amounts[i]:.2f}")
         print(f"Predicted: {demo_predictions[i]}")
     
     print("\n=== Testing Complete ===")
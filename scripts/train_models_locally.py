@@ -6,8 +6,10 @@ This avoids the need for Cloud Storage access during development
 
 import os
 import sys
+import numpy as np
 import pandas as pd
 import logging
+from joblib import Parallel, delayed
 from datetime import datetime
 
 # Add project root to Python path
@@ -19,7 +21,7 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(level
 logger = logging.getLogger(__name__)
 
 # Import our modules
-from src.models.transaction_trainer import TransactionModelTrainer, extract_vendor_features
+from src.models.transaction_trainer import TransactionModelTrainer, VENDOR_PATTERNS, extract_vendor_features
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.pipeline import Pipeline
@@ -27,6 +29,39 @@ from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import FunctionTransformer
 from sklearn.multioutput import MultiOutputClassifier
 
+# Model input columns, in the order the production pipeline expects them
+_TEXT_COLUMNS = ('vendor', 'vendor_cleaned', 'cleaned_metaphone',
+                 'template_used', 'account', 'day', 'month', 'year', 'day_name')
+_VENDOR_FEATURE_COLUMNS = tuple(dict.fromkeys(name for _, name in VENDOR_PATTERNS))
+_FEATURE_COLUMNS = _TEXT_COLUMNS + _VENDOR_FEATURE_COLUMNS
+_TEXT_DTYPES = {col: str for col in _TEXT_COLUMNS}
+
+# CSV columns read for training; the derived vendor and date columns in the
+# sample file are recomputed, so they are not loaded
+_TRAINING_CSV_COLUMNS = ['vendor', 'amount', 'account', 'template_used', 'date',
+                         'category', 'subcategory', 'is_user_corrected']
+# CSV columns read for sample predictions (precomputed features plus display fields)
+_SAMPLE_CSV_COLUMNS = list(_TEXT_COLUMNS) + ['amount', 'date', 'category', 'subcategory']
+
+# Distinct vendors from which metaphone codes are computed in worker processes;
+# at ~60us per code, smaller sets finish before the workers would start
+_PARALLEL_METAPHONE_MIN = 20000
+
+
+def _metaphone_code(text: str) -> str:
+    """Generate the metaphone code for text (same as FeatureEngineer)"""
+    from metaphone import doublemetaphone
+    
+    if not text or text == 'unknown':
+        return 'unknown'
+    
+    try:
+        primary, secondary = doublemetaphone(text)
+        # Return primary code, or secondary if primary is None
+        return primary or secondary or 'unknown'
+    except:
+        return 'unknown'
+
 class LocalTransactionTrainer(TransactionModelTrainer):
     """Extended trainer that can load from local CSV files and uses production logic"""
     
@@ -42,33 +77,40 @@ class LocalTransactionTrainer(TransactionModelTrainer):
         else:
             super().__init__(project_id)
             
-    # Use the parent's create_pipeline method (no need to duplicate)
-    # The production logic is already correct
+    def create_pipeline(self):
+        """Create the production pipeline, building the forest's trees on all cores
+        
+        The model itself is unchanged: with a fixed random_state the trees are
+        identical whatever the number of jobs.
+        """
+        pipeline = super().create_pipeline()
+        pipeline.set_params(multi_target_classifier__estimator__n_jobs=-1)
+        return pipeline
             
     def load_training_data_from_csv(self, csv_path: str) -> pd.DataFrame:
         """Load training data from local CSV file and apply proper transformations"""
         self.logger.info(f"Loading training data from CSV: {csv_path}")
         
-        # Load CSV data
-        df = pd.read_csv(csv_path)
+        # Load only the needed CSV columns with the multithreaded PyArrow parser
+        df = pd.read_csv(csv_path, engine='pyarrow', usecols=_TRAINING_CSV_COLUMNS, parse_dates=['date'])
         self.logger.info(f"Loaded {len(df)} records from CSV")
         
-        # Ensure date column is datetime
-        df['date'] = pd.to_datetime(df['date'])
-        
         # Apply the same transformations as production FeatureEngineer
         # Clean vendor names and generate metaphone codes
         if 'vendor' in df.columns:
             # Clean vendor names
-            df['vendor_cleaned'] = df['vendor'].apply(self._clean_vendor_name)
-            # Generate metaphone codes
-            df['cleaned_metaphone'] = df['vendor_cleaned'].apply(self._generate_metaphone)
-        
-        # Extract date components
-        df['day'] = df['date'].dt.day
-        df['month'] = df['date'].dt.month
-        df['year'] = df['date'].dt.year
-        df['day_name'] = df['date'].dt.day_name()
+            df['vendor_cleaned'] = self._clean_vendor_names(df['vendor'])
+            # Generate metaphone codes once per distinct cleaned vendor
+            unique_vendors = df['vendor_cleaned'].unique()
+            if len(unique_vendors) >= _PARALLEL_METAPHONE_MIN:
+                codes = Parallel(n_jobs=-1)(delayed(_metaphone_code)(vendor) for vendor in unique_vendors)
+            else:
+                codes = [_metaphone_code(vendor) for vendor in unique_vendors]
+            df['cleaned_metaphone'] = df['vendor_cleaned'].map(dict(zip(unique_vendors, codes)))
+        
+        # Extract date components from a single DatetimeIndex view of the column
+        dates = pd.DatetimeIndex(df['date'])
+        df = df.assign(day=dates.day, month=dates.month, year=dates.year, day_name=dates.day_name())
         
         # Ensure text columns have content (fill empty values)
         text_columns = ['vendor', 'vendor_cleaned', 'cleaned_metaphone', 'template_used', 'account']
@@ -80,33 +122,15 @@ class LocalTransactionTrainer(TransactionModelTrainer):
         
         return df
     
-    def _clean_vendor_name(self, vendor: str) -> str:
-        """Clean vendor name by removing special characters (same as FeatureEngineer)"""
-        import re
-        if pd.isna(vendor):
-            return 'unknown'
-        
+    def _clean_vendor_names(self, vendors: pd.Series) -> pd.Series:
+        """Clean vendor names by removing special characters (same as FeatureEngineer)"""
         # Remove special characters and convert to lowercase
-        cleaned = re.sub('[^A-Za-z ]+', ' ', str(vendor).lower())
+        cleaned = vendors.astype(str).str.lower().str.replace('[^A-Za-z ]+', ' ', regex=True)
         # Remove multiple spaces
-        cleaned = re.sub(' +', ' ', cleaned).strip()
+        cleaned = cleaned.str.replace(' +', ' ', regex=True).str.strip()
         
-        return cleaned if cleaned else 'unknown'
+        return cleaned.mask(vendors.isna() | cleaned.eq(''), 'unknown')
     
-    def _generate_metaphone(self, text: str) -> str:
-        """Generate metaphone codes for text (same as FeatureEngineer)"""
-        from metaphone import doublemetaphone
-        
-        if not text or text == 'unknown':
-            return 'unknown'
-        
-        try:
-            primary, secondary = doublemetaphone(text)
-            # Return primary code, or secondary if primary is None
-            return primary or secondary or 'unknown'
-        except:
-            return 'unknown'
-        
     def train_model_locally(self, csv_path: str = None):
         """Train model using local CSV data with production logic"""
         # Use default sample data if no path provided
@@ -126,18 +150,9 @@ class LocalTransactionTrainer(TransactionModelTrainer):
         from sklearn.metrics import accuracy_score
         
         # Prepare test data for evaluation (same as parent method)
-        text_columns = ['vendor', 'vendor_cleaned', 'cleaned_metaphone',
-                       'template_used', 'account', 'day', 'month', 'year', 'day_name']
-        vendor_features = ['amazon', 'aramark', 'great_clips', 'ohio_state', 'student_loan', 
-                          'bar', 'supplements', 'best_buy', 'loan']
-        feature_columns = text_columns + vendor_features
-        
-        # Apply vendor features to test data
         test_df = extract_vendor_features(test_df.copy())
         
-        X_test = test_df[feature_columns].copy()
-        for col in text_columns:
-            X_test[col] = X_test[col].astype(str)
+        X_test = test_df[list(_FEATURE_COLUMNS)].astype(_TEXT_DTYPES)
         y_test = test_df[['category', 'subcategory']].astype('string')
         
         # Make predictions
@@ -152,28 +167,28 @@ class LocalTransactionTrainer(TransactionModelTrainer):
         model_path = os.path.join('ml_models', f'local_model_{datetime.now().strftime("%Y%m%d_%H%M%S")}.joblib')
         os.makedirs('ml_models', exist_ok=True)
         
-        with open(model_path, 'wb') as f:
-            joblib.dump(pipeline, f)
+        # zlib level 3 shrinks the forest and TF-IDF vocabularies severalfold at a
+        # small write cost; protocol 5 pickles large numpy buffers without extra copies.
+        # Compressed files cannot be memory-mapped, so loaders read them without mmap_mode
+        joblib.dump(pipeline, model_path, compress=3, protocol=5)
         
         self.logger.info(f"Model saved locally to: {model_path}")
         
         return pipeline, category_accuracy, subcategory_accuracy
         
-    def test_predictions(self, pipeline, sample_count: int = 5):
-        """Test the model with some sample predictions"""
+    def test_predictions(self, pipeline, sample_count: int = 5, seed: int = None):
+        """Test the model with some sample predictions (pass seed for a repeatable sample)"""
         # Load some test data
         csv_path = os.path.join(project_root, 'test_data', 'sample_transactions.csv')
-        df = pd.read_csv(csv_path)
-        
-        # Take a random sample
-        sample_df = df.sample(n=min(sample_count, len(df)))
+        df = pd.read_csv(csv_path, engine='pyarrow', usecols=_SAMPLE_CSV_COLUMNS, parse_dates=['date'])
         
-        feature_columns = ['vendor', 'vendor_cleaned', 'cleaned_metaphone',
-                          'template_used', 'account', 'day', 'month', 'year', 'day_name']
+        # Take a random sample by drawing row positions, without shuffling the whole frame
+        rng = np.random.default_rng(seed)
+        sample_df = df.iloc[rng.choice(len(df), size=min(sample_count, len(df)), replace=False)]
         
-        X_sample = sample_df[feature_columns].copy()
-        for col in feature_columns:
-            X_sample[col] = X_sample[col].astype(str)
+        # Same inputs as training: text columns plus the vendor flags
+        sample_df = extract_vendor_features(sample_df.copy())
+        X_sample = sample_df[list(_FEATURE_COLUMNS)].astype(_TEXT_DTYPES)
         
         # Make predictions
         predictions = pipeline.predict(X_sample)
@@ -15,11 +15,16 @@ from src.utils.config import Config
 
 
 def verify_model_structure(model_path):
-    """Verify the structure of a saved model"""
+    """Verify the structure of a saved model
+    
+    Returns (ok, model) so callers can reuse the loaded model; model is None
+    if loading failed.
+    """
     print(f"\n=== Verifying Model Structure: {model_path} ===")
     
+    model = None
     try:
-        # Load the model
+        # Load the model (saved compressed, so it is read fully into memory)
         model = joblib.load(model_path)
         print(f"✓ Model loaded successfully")
         
@@ -85,17 +90,20 @@ def verify_model_structure(model_path):
                         print(f"    ✗ Failed: {step_e}")
                         break
         
-        return True
+        return True, model
         
     except Exception as e:
         print(f"✗ Failed to verify model: {e}")
         import traceback
         traceback.print_exc()
-        return False
+        return False, model
 
 
-def test_with_feature_engineering(model_path):
-    """Test model with proper feature engineering"""
+def test_with_feature_engineering(model_path, model=None):
+    """Test model with proper feature engineering
+    
+    Pass an already loaded model to skip deserializing model_path again.
+    """
     print(f"\n=== Testing Model with Feature Engineering ===")
     
     try:
@@ -103,8 +111,9 @@ def test_with_feature_engineering(model_path):
         config = Config()
         project_id = config.get('project', 'id')
         
-        # Load model to get version
-        model = joblib.load(model_path)
+        # Load model unless the caller already did; the version comes from the path
+        if model is None:
+            model = joblib.load(model_path)
         model_version = os.path.basename(model_path).replace('.joblib', '')
         
         # Initialize feature engineer
@@ -163,10 +172,10 @@ def main():
         return 1
     
     # Verify model structure
-    structure_ok = verify_model_structure(args.model)
+    structure_ok, model = verify_model_structure(args.model)
     
-    # Test with feature engineering
-    feature_ok = test_with_feature_engineering(args.model)
+    # Test with feature engineering, reusing the loaded model
+    feature_ok = test_with_feature_engineering(args.model, model=model)
     
     print("\n" + "=" * 60)
     if structure_ok and feature_ok:
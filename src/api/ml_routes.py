@@ -1,9 +1,16 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
+from werkzeug.exceptions import RequestEntityTooLarge
 from src.services.ml_prediction_service import MLPredictionService
 from src.services.ml_feedback_service import MLFeedbackService
 from src.utils.transaction_dao import TransactionDAO
 from typing import Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+import cachetools
 import logging
+import os
+import queue
+import threading
+import time
 
 # Create blueprint
 ml_bp = Blueprint('ml', __name__, url_prefix='/api/v1/ml')
@@ -11,25 +18,224 @@ ml_bp = Blueprint('ml', __name__, url_prefix='/api/v1/ml')
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Services will be initialized with app context
-ml_prediction_service = None
-ml_feedback_service = None
-transaction_dao = None
+# Services are created on first use so cold starts and endpoints that don't
+# need them skip the client construction; init_services only records the project
+_PROJECT_ID = None
+_services = {}
+_services_lock = threading.Lock()
+
+# Bounded pool shared by blocking ML service calls and fire-and-forget
+# post-predict work, so bursts queue instead of oversubscribing the server
+ml_executor = None
+
+# /predict requests arriving within PREDICT_MAX_WAIT_MS of each other are
+# coalesced into one model call of up to PREDICT_MAX_BATCH transactions
+PREDICT_MAX_BATCH = 128
+PREDICT_MAX_WAIT_MS = 10
+PREDICT_TIMEOUT_SECONDS = 60
+_predict_queue = queue.Queue()
+
+# Largest transactions list a single /predict request may carry; the body size
+# limit of /predict is derived from it so oversized bodies are never read
+MAX_PREDICT_TRANSACTIONS = int(os.environ.get('MAX_PREDICT_BATCH', 1000))
+PREDICT_MAX_BYTES_PER_TRANSACTION = 2048
+PREDICT_MAX_CONTENT_LENGTH = MAX_PREDICT_TRANSACTIONS * PREDICT_MAX_BYTES_PER_TRANSACTION
+_predict_batcher = None
+
+# Per-user /categories results; category lists change slowly, and /feedback
+# evicts the user's entry whenever it changes one
+_categories_cache = cachetools.TTLCache(maxsize=1024, ttl=300)
+_categories_lock = threading.Lock()
+CATEGORIES_MAX_AGE_SECONDS = 60
+
+# Serialized /model/info body and its monotonic expiry; health checks poll this
+# endpoint, so the availability probe and encoding run at most once per TTL
+MODEL_INFO_TTL_SECONDS = 10
+_model_info_cache = (0.0, None)
+
+# Fields every /feedback request must include, in the order they are reported
+_FEEDBACK_REQUIRED_FIELDS = ('transaction_id', 'user_id', 'new_category')
+_FEEDBACK_REQUIRED_SET = frozenset(_FEEDBACK_REQUIRED_FIELDS)
 
 
 def init_services(project_id: str):
-    """Initialize services with project ID"""
-    global ml_prediction_service, ml_feedback_service, transaction_dao
-    ml_prediction_service = MLPredictionService(project_id)
-    ml_feedback_service = MLFeedbackService(project_id)
-    transaction_dao = TransactionDAO(project_id)
+    """Record the project ID for the lazily created services and start the workers"""
+    global _PROJECT_ID, ml_executor, _predict_batcher
+    _PROJECT_ID = project_id
+    
+    if ml_executor is None:
+        ml_executor = ThreadPoolExecutor(max_workers=int(os.environ.get('ML_THREADS', 8)), thread_name_prefix='ml')
+    if _predict_batcher is None:
+        _predict_batcher = threading.Thread(target=_run_predict_batcher, name='predict-batcher', daemon=True)
+        _predict_batcher.start()
+
+
+def warm_up_services():
+    """Create the prediction service and probe the model in the background
+    
+    The first /predict request would otherwise pay for client construction and
+    authentication; failures are only logged since the routes retry lazily.
+    """
+    def _warm_up():
+        try:
+            _pred().is_available()
+        except Exception as e:
+            logger.warning(f"ML service warm-up failed: {e}")
+    
+    ml_executor.submit(_warm_up)
+
+
+def _get_service(name: str, factory):
+    """Return the named service, creating it with the project ID on first use"""
+    service = _services.get(name)
+    if service is None:
+        with _services_lock:
+            service = _services.get(name)
+            if service is None:
+                service = _services[name] = factory(_PROJECT_ID)
+    return service
+
+
+def _pred() -> MLPredictionService:
+    return _get_service('pred', MLPredictionService)
+
+
+def _fb() -> MLFeedbackService:
+    return _get_service('fb', MLFeedbackService)
+
+
+def _dao() -> TransactionDAO:
+    return _get_service('dao', TransactionDAO)
+
+
+def _run_predict_batcher():
+    """Drain queued (transactions, future) requests and dispatch them as shared batches"""
+    while True:
+        pending = [_predict_queue.get()]
+        batch_size = len(pending[0][0])
+        deadline = time.monotonic() + PREDICT_MAX_WAIT_MS / 1000
+        
+        # Collect more requests until the batch is full or the wait window closes
+        while batch_size < PREDICT_MAX_BATCH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = _predict_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            pending.append(item)
+            batch_size += len(item[0])
+        
+        # Predict on the ML pool so the batcher can keep collecting meanwhile; if the
+        # pool rejects the work (e.g. it was shut down) fail these requests rather
+        # than letting the exception end this loop
+        try:
+            ml_executor.submit(_predict_pending, pending)
+        except Exception as e:
+            logger.error(f"Could not dispatch {len(pending)} prediction requests: {e}")
+            for _, future in pending:
+                future.set_exception(e)
+
+
+def _check_prediction_count(predictions: list, transactions: list):
+    """Raise if the service did not return exactly one prediction per transaction"""
+    if len(predictions) != len(transactions):
+        raise RuntimeError(
+            f"Prediction service returned {len(predictions)} results for {len(transactions)} transactions"
+        )
+
+
+def _predict_request(transactions: list, future: Future):
+    """Predict one request's transactions on their own and resolve its future"""
+    try:
+        predictions = _pred().predict_categories(transactions)
+        _check_prediction_count(predictions, transactions)
+    except Exception as e:
+        future.set_exception(e)
+    else:
+        future.set_result(predictions)
+
+
+def _predict_pending(pending: list):
+    """Predict one coalesced batch and scatter the results to each request's future"""
+    if len(pending) == 1:
+        _predict_request(*pending[0])
+        return
+    
+    batch = [transaction for transactions, _ in pending for transaction in transactions]
+    try:
+        predictions = _pred().predict_categories(batch)
+        _check_prediction_count(predictions, batch)
+    except Exception as e:
+        # Results can only be scattered by offset when every transaction got exactly
+        # one prediction; otherwise predict each request separately so one client's
+        # failure or short result is never attributed to another
+        logger.warning(f"Batched prediction for {len(pending)} requests failed, retrying individually: {e}")
+        for transactions, future in pending:
+            _predict_request(transactions, future)
+        return
+    
+    # Scatter the predictions back to each request in submission order
+    offset = 0
+    for transactions, future in pending:
+        future.set_result(predictions[offset:offset + len(transactions)])
+        offset += len(transactions)
+
+
+def _log_predictions(predictions: list, model_version):
+    """Summarize a completed prediction request off the request thread"""
+    categories = {}
+    for prediction in predictions:
+        category = prediction.get('category') if isinstance(prediction, dict) else None
+        categories[category] = categories.get(category, 0) + 1
+    logger.info(f"Predicted {len(predictions)} transactions with model {model_version}: {categories}")
+
+
+def _predict_batched(transactions: list) -> list:
+    """Queue transactions for the micro-batcher and wait for their predictions"""
+    if _predict_batcher is None:
+        # init_services was not called, so nothing drains the queue; predict inline
+        predictions = _pred().predict_categories(transactions)
+        _check_prediction_count(predictions, transactions)
+        return predictions
+    
+    future = Future()
+    _predict_queue.put((transactions, future))
+    return future.result(timeout=PREDICT_TIMEOUT_SECONDS)
 
 
 @ml_bp.route('/predict', methods=['POST'])
 def predict_categories():
     """Batch prediction endpoint for transaction categories"""
     try:
-        data = request.get_json()
+        if not request.is_json:
+            return jsonify({
+                'error': 'Request body must be JSON'
+            }), 415
+        
+        # Only /predict takes large bodies, so the size limit is set for this
+        # request rather than app-wide. Flask < 3.1 cannot set it per request;
+        # there only the declared Content-Length below is checked
+        try:
+            request.max_content_length = PREDICT_MAX_CONTENT_LENGTH
+        except AttributeError:
+            pass
+        
+        # Parse the body directly without caching the raw bytes or the parsed result
+        # on the request, so a large batch is only held once
+        try:
+            if (request.content_length or 0) > PREDICT_MAX_CONTENT_LENGTH:
+                raise RequestEntityTooLarge()
+            data = current_app.json.loads(request.get_data(cache=False))
+        except RequestEntityTooLarge:
+            return jsonify({
+                'error': 'Request body too large'
+            }), 413
+        except ValueError:
+            return jsonify({
+                'error': 'Invalid JSON body'
+            }), 400
         
         if not data or 'transactions' not in data:
             return jsonify({
@@ -42,12 +248,30 @@ def predict_categories():
                 'error': 'Transactions must be a list'
             }), 400
         
-        # Make predictions
-        predictions = ml_prediction_service.predict_categories(transactions)
+        if len(transactions) > MAX_PREDICT_TRANSACTIONS:
+            return jsonify({
+                'error': f'Too many transactions (maximum {MAX_PREDICT_TRANSACTIONS})'
+            }), 413
+        
+        if not all(isinstance(transaction, dict) for transaction in transactions):
+            return jsonify({
+                'error': 'Each transaction must be an object'
+            }), 400
+        
+        # Make predictions, batched with concurrent requests
+        predictions = _predict_batched(transactions)
+        model_version = _pred().get_current_model_version()
+        
+        # Post-predict work runs on the shared ML pool without delaying the response
+        if logger.isEnabledFor(logging.INFO):
+            if ml_executor is not None:
+                ml_executor.submit(_log_predictions, predictions, model_version)
+            else:
+                _log_predictions(predictions, model_version)
         
         return jsonify({
             'predictions': predictions,
-            'model_version': ml_prediction_service.get_current_model_version()
+            'model_version': model_version
         }), 200
         
     except Exception as e:
@@ -63,18 +287,21 @@ def submit_feedback():
     """Submit category correction feedback"""
     try:
         data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({
+                'error': 'Request body must be a JSON object'
+            }), 400
         
-        # Validate required fields
-        required_fields = ['transaction_id', 'user_id', 'new_category']
-        missing_fields = [f for f in required_fields if f not in data]
-        
-        if missing_fields:
+        # Validate required fields against the keys view, which checks membership
+        # without copying the keys; the ordered list is only built when some are missing
+        if not data.keys() >= _FEEDBACK_REQUIRED_SET:
+            missing_fields = [f for f in _FEEDBACK_REQUIRED_FIELDS if f not in data]
             return jsonify({
                 'error': f'Missing required fields: {", ".join(missing_fields)}'
             }), 400
         
         # Update transaction category (this will also record feedback)
-        success = transaction_dao.update_transaction_category(
+        success = _dao().update_transaction_category(
             transaction_id=data['transaction_id'],
             user_id=data['user_id'],
             new_category=data['new_category'],
@@ -84,6 +311,8 @@ def submit_feedback():
         )
         
         if success:
+            with _categories_lock:
+                _categories_cache.pop(data['user_id'], None)
             return jsonify({
                 'status': 'success',
                 'message': 'Category updated and feedback recorded'
@@ -109,24 +338,32 @@ def get_model_metrics():
         days = request.args.get('days', 30, type=int)
         include_categories = request.args.get('include_categories', 'false').lower() == 'true'
         
-        # Get model metrics from ML service
-        model_metrics = ml_prediction_service.get_model_metrics()
+        # The service lookups are independent round trips, so overlap them on the
+        # shared ML pool; only category accuracy has to wait for the model version
+        prediction_service = _pred()
+        feedback_service = _fb()
+        model_version_future = ml_executor.submit(prediction_service.get_current_model_version)
+        model_metrics_future = ml_executor.submit(prediction_service.get_model_metrics)
+        feedback_stats_future = ml_executor.submit(feedback_service.get_feedback_stats, days=days)
         
-        # Get feedback statistics
-        feedback_stats = ml_feedback_service.get_feedback_stats(days=days)
-        
-        response = {
-            'model_version': ml_prediction_service.get_current_model_version(),
-            'model_metrics': model_metrics,
-            'feedback_stats': feedback_stats
-        }
+        model_version = model_version_future.result()
         
         # Include category-specific accuracy if requested
+        category_accuracy_future = None
         if include_categories:
-            category_accuracy = ml_feedback_service.get_category_accuracy(
-                model_version=ml_prediction_service.get_current_model_version()
+            category_accuracy_future = ml_executor.submit(
+                feedback_service.get_category_accuracy,
+                model_version=model_version
             )
-            response['category_accuracy'] = category_accuracy
+        
+        response = {
+            'model_version': model_version,
+            'model_metrics': model_metrics_future.result(),
+            'feedback_stats': feedback_stats_future.result()
+        }
+        
+        if category_accuracy_future is not None:
+            response['category_accuracy'] = category_accuracy_future.result()
         
         return jsonify(response), 200
         
@@ -141,15 +378,22 @@ def get_model_metrics():
 @ml_bp.route('/model/info', methods=['GET'])
 def get_model_info():
     """Get information about the current deployed model"""
+    global _model_info_cache
     try:
-        is_available = ml_prediction_service.is_available()
-        model_version = ml_prediction_service.get_current_model_version()
+        now = time.monotonic()
+        expires, body = _model_info_cache
+        if now >= expires:
+            is_available = _pred().is_available()
+            model_version = _pred().get_current_model_version()
+            
+            body = current_app.json.dumps({
+                'available': is_available,
+                'model_version': model_version,
+                'status': 'active' if is_available else 'unavailable'
+            })
+            _model_info_cache = (now + MODEL_INFO_TTL_SECONDS, body)
         
-        return jsonify({
-            'available': is_available,
-            'model_version': model_version,
-            'status': 'active' if is_available else 'unavailable'
-        }), 200
+        return current_app.response_class(body, mimetype='application/json'), 200
         
     except Exception as e:
         logger.error(f"Model info error: {e}", exc_info=True)
@@ -169,12 +413,19 @@ def get_categories():
                 'error': 'Missing user_id parameter'
             }), 400
         
-        # Get categories from transaction DAO
-        categories = transaction_dao.get_categories(user_id)
+        # Serve recent results from memory; the DAO is queried outside the lock
+        with _categories_lock:
+            categories = _categories_cache.get(user_id)
+        if categories is None:
+            categories = _dao().get_categories(user_id)
+            with _categories_lock:
+                _categories_cache[user_id] = categories
         
-        return jsonify({
+        response = jsonify({
             'categories': categories
-        }), 200
+        })
+        response.headers['Cache-Control'] = f'private, max-age={CATEGORIES_MAX_AGE_SECONDS}'
+        return response, 200
         
     except Exception as e:
         logger.error(f"Categories error: {e}", exc_info=True)
@@ -1,13 +1,60 @@
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from src.api.routes import register_routes
-from src.api.ml_routes import ml_bp, init_services
+from src.api.ml_routes import ml_bp, init_services, warm_up_services
 from src.utils.config import Config
 from src.utils.credentials_manager import CredentialsManager
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson
+    
+    Keys are not sorted. Datetimes and other types orjson does not handle are passed
+    to the default provider's hook, so they serialize as before. Compact output,
+    which is what jsonify asks for outside debug mode, is encoded by orjson;
+    indented output, other encoder arguments and values orjson rejects fall back
+    to the standard library.
+    """
+    sort_keys = False
+    
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+    
+    # json.dumps arguments orjson can honour; orjson output is always compact and
+    # never escapes non-ASCII, which is equivalent JSON either way
+    _ORJSON_KWARGS = frozenset(('separators', 'ensure_ascii', 'sort_keys'))
+    _COMPACT_SEPARATORS = (',', ':')
+    
+    def dumps(self, obj, **kwargs):
+        if (kwargs.keys() <= self._ORJSON_KWARGS
+                and tuple(kwargs.get('separators', self._COMPACT_SEPARATORS)) == self._COMPACT_SEPARATORS):
+            option = self._OPTIONS
+            if kwargs.get('sort_keys', self.sort_keys):
+                option |= orjson.OPT_SORT_KEYS
+            try:
+                return orjson.dumps(obj, default=self.default, option=option).decode()
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
 def create_app():
     config = Config()
     app = Flask(__name__)
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    
+    # Treat '/path' and '/path/' alike instead of answering with a redirect;
+    # must be set before any rules are registered
+    app.url_map.strict_slashes = False
     
     # Use config values instead of hardcoded values
     app.config['PROJECT_ID'] = config.get('project', 'id')
@@ -27,6 +74,11 @@ def create_app():
     # Initialize ML services
     init_services(app.config['PROJECT_ID'])
     
+    # Build the URL matcher now rather than on the first request, and start
+    # warming the prediction service without blocking startup
+    app.url_map.update()
+    warm_up_services()
+    
     return app
 
 def main():
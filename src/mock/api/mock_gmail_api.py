@@ -3,13 +3,14 @@ Mock implementations of Gmail API responses and structures.
 Loads real transaction messages that were previously validated in production.
 """
 
-import os
-import sys
 from typing import Dict, Any, List, Optional
 
-# Add the project root directory to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.append(project_root)
+# Production messages captured by scripts/generate_mock_template_messages.py;
+# the module is absent until that script has been run
+try:
+    from src.mock.api.mock_messages import MOCK_MESSAGES
+except ImportError:
+    MOCK_MESSAGES = {}
 
 def get_mock_message_by_template(template_name: str) -> Optional[Dict[str, Any]]:
     """
@@ -21,11 +22,7 @@ def get_mock_message_by_template(template_name: str) -> Optional[Dict[str, Any]]
     Returns:
         Optional[Dict[str, Any]]: The mock message if found, None otherwise.
     """
-    try:
-        from src.mock.api.mock_messages import MOCK_MESSAGES
-        return MOCK_MESSAGES.get(template_name)
-    except ImportError:
-        return None
+    return MOCK_MESSAGES.get(template_name)
 
 def get_all_mock_messages() -> Dict[str, Dict[str, Any]]:
     """
@@ -34,11 +31,7 @@ def get_all_mock_messages() -> Dict[str, Dict[str, Any]]:
     Returns:
         Dict[str, Dict[str, Any]]: Dictionary of template names to mock messages.
     """
-    try:
-        from src.mock.api.mock_messages import MOCK_MESSAGES
-        return MOCK_MESSAGES
-    except ImportError:
-        return {}
+    return MOCK_MESSAGES
 
 def get_mock_messages_list() -> List[str]:
     """
@@ -47,8 +40,4 @@ def get_mock_messages_list() -> List[str]:
     Returns:
         List[str]: List of template names.
     """
-    try:
-        from src.mock.api.mock_messages import MOCK_MESSAGES
-        return list(MOCK_MESSAGES.keys())
-    except ImportError:
-        return []
\ No newline at end of file
+    return list(MOCK_MESSAGES.keys())
\ No newline at end of file
@@ -5,8 +5,7 @@ specific scenarios that are hard to capture from production.
 """
 
 import base64
-from typing import Dict, Any, List
-from unittest.mock import MagicMock
+from typing import Dict, Any, List, Optional
 
 def create_mock_message(subject: str, body: str, from_addr: str, date: str) -> Dict[str, Any]:
     """
@@ -21,6 +20,10 @@ def create_mock_message(subject: str, body: str, from_addr: str, date: str) -> D
     Returns:
         Dict matching Gmail API message format
     """
+    return _build_mock_message(subject, base64.urlsafe_b64encode(body.encode()).decode(), from_addr, date)
+
+def _build_mock_message(subject: str, encoded_body: str, from_addr: str, date: str) -> Dict[str, Any]:
+    """Build a Gmail-format message around an already base64url-encoded body."""
     return {
         'id': '12345',
         'threadId': 'thread123',
@@ -32,7 +35,7 @@ def create_mock_message(subject: str, body: str, from_addr: str, date: str) -> D
                 {'name': 'Date', 'value': date}
             ],
             'body': {
-                'data': base64.urlsafe_b64encode(body.encode()).decode()
+                'data': encoded_body
             }
         }
     }
@@ -127,51 +130,100 @@ INTEGRATION_TEST_MESSAGES = {
     }
 }
 
+# Integration test bodies encoded once at import; messages are still built fresh
+# per call since callers annotate the dicts they receive
+_ENCODED_BODIES = {
+    name: base64.urlsafe_b64encode(test_msg['body'].strip().encode()).decode()
+    for name, test_msg in INTEGRATION_TEST_MESSAGES.items()
+}
+
+# Integration test message names keyed by Gmail API id
+_NAMES_BY_API_ID = {
+    test_msg['parsed_data']['id_api']: name
+    for name, test_msg in INTEGRATION_TEST_MESSAGES.items()
+}
+
+def _integration_message(name: str) -> Dict[str, Any]:
+    """Gmail-format message for the named integration test message."""
+    test_msg = INTEGRATION_TEST_MESSAGES[name]
+    return _build_mock_message(
+        subject=test_msg['subject'],
+        encoded_body=_ENCODED_BODIES[name],
+        from_addr=test_msg['from_addr'],
+        date=test_msg['date']
+    )
+
+class _MockRequest:
+    """Stand-in for a Gmail API request; execute() returns the canned response."""
+    __slots__ = ('_response',)
+
+    def __init__(self, response: Optional[Dict[str, Any]]):
+        self._response = response
+
+    def execute(self) -> Optional[Dict[str, Any]]:
+        return self._response
+
+class _MockBatchRequest:
+    """Stand-in for a batch HTTP request; reports each added request to the callback."""
+    __slots__ = ('_callback', '_requests')
+
+    def __init__(self, callback):
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request: _MockRequest, request_id: str = None):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self._requests:
+            self._callback(request_id, request.execute(), None)
+
+class _MockMessages:
+    """users().messages() resource backed by the integration test messages."""
+    __slots__ = ('_list_response',)
+
+    def __init__(self, list_response: Dict[str, Any]):
+        self._list_response = list_response
+
+    def list(self, **kwargs) -> _MockRequest:
+        return _MockRequest(self._list_response)
+
+    def get(self, *args, id: str = None, **kwargs) -> _MockRequest:
+        name = _NAMES_BY_API_ID.get(id)
+        return _MockRequest(_integration_message(name) if name else None)
+
+    def modify(self, **kwargs) -> _MockRequest:
+        return _MockRequest({})
+
+class _MockUsers:
+    __slots__ = ('_messages',)
+
+    def __init__(self, messages: _MockMessages):
+        self._messages = messages
+
+    def messages(self) -> _MockMessages:
+        return self._messages
+
+class _MockGmailService:
+    __slots__ = ('_users',)
+
+    def __init__(self, users: _MockUsers):
+        self._users = users
+
+    def users(self) -> _MockUsers:
+        return self._users
+
+    def new_batch_http_request(self, callback=None) -> _MockBatchRequest:
+        return _MockBatchRequest(callback)
+
 def get_mock_gmail_service():
     """
-    Creates a mock Gmail service with predefined responses
+    Creates a mock Gmail service with predefined responses.
+
+    Plain stub classes stand in for the discovery client rather than a MagicMock
+    tree, so each users().messages().get(...).execute() chain is ordinary calls.
     """
-    mock_service = MagicMock()
-    mock_messages = []
-    
     # Create mock messages from test data
-    for test_msg in INTEGRATION_TEST_MESSAGES.values():
-        mock_messages.append(
-            create_mock_message(
-                subject=test_msg['subject'],
-                body=test_msg['body'].strip(),
-                from_addr=test_msg['from_addr'],
-                date=test_msg['date']
-            )
-        )
-    
-    # Mock list messages
-    mock_list = MagicMock()
-    mock_list.execute.return_value = {'messages': mock_messages}
-    mock_messages_api = MagicMock()
-    mock_messages_api.list.return_value = mock_list
-    
-    # Mock get message
-    def mock_get_message(*args, **kwargs):
-        mock_get = MagicMock()
-        msg_id = kwargs.get('id')
-        for test_msg in INTEGRATION_TEST_MESSAGES.values():
-            if test_msg['parsed_data']['id_api'] == msg_id:
-                mock_get.execute.return_value = create_mock_message(
-                    subject=test_msg['subject'],
-                    body=test_msg['body'].strip(),
-                    from_addr=test_msg['from_addr'],
-                    date=test_msg['date']
-                )
-                return mock_get
-        mock_get.execute.return_value = None
-        return mock_get
-    
-    mock_messages_api.get = mock_get_message
-    
-    # Set up service mock
-    mock_users = MagicMock()
-    mock_users.messages.return_value = mock_messages_api
-    mock_service.users.return_value = mock_users
-    
-    return mock_service
\ No newline at end of file
+    mock_messages = [_integration_message(name) for name in INTEGRATION_TEST_MESSAGES]
+
+    return _MockGmailService(_MockUsers(_MockMessages({'messages': mock_messages})))
\ No newline at end of file
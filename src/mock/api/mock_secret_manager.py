@@ -2,23 +2,21 @@
 Mock implementations of Secret Manager API responses and structures.
 """
 
-import os
-import sys
 import json
 from typing import Dict, Any
 from google.api_core import exceptions
 
-# Add the project root directory to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.append(project_root)
-
 class MockSecretVersion:
     """Mock Secret Version response"""
+    __slots__ = ('payload',)
+    
     def __init__(self, payload: str):
         self.payload = MockPayload(payload)
 
 class MockPayload:
     """Mock Secret Payload"""
+    __slots__ = ('_data',)
+    
     def __init__(self, data: str):
         self._data = data
     
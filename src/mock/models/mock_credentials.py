@@ -2,17 +2,16 @@
 Mock credential objects and factories.
 """
 
-import os
-import sys
 from typing import Dict, Any
 from unittest.mock import MagicMock
 
-# Add the project root directory to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.append(project_root)
-
 class MockOAuth2Credentials(object):
     """Mock OAuth2 credentials"""
+    __slots__ = (
+        'token', 'refresh_token', 'token_uri', 'client_id', 'client_secret', 'scopes',
+        'universe_domain', 'expiry', 'expired', 'valid', '_json'
+    )
+    
     def __init__(self, token=None, refresh_token=None, token_uri=None, client_id=None, client_secret=None, scopes=None, **kwargs):
         self.token = token or 'mock_token'
         self.refresh_token = refresh_token or 'mock_refresh_token'
@@ -24,27 +23,31 @@ class MockOAuth2Credentials(object):
         self.expiry = None
         self.expired = False
         self.valid = True
+        
+        # Serialized form is built once; refresh() keeps its token current
+        self._json = {
+            'token': self.token,
+            'refresh_token': self.refresh_token,
+            'token_uri': self.token_uri,
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'scopes': self.scopes,
+            'universe_domain': self.universe_domain
+        }
     
     def refresh(self, request):
         """Mock refresh method"""
         self.token = 'refreshed_mock_token'
         self.expired = False
+        self._json['token'] = self.token
     
     def has_scopes(self, scopes):
         """Mock has_scopes method"""
         return all(scope in self.scopes for scope in scopes)
     
     def to_json(self):
-        """Mock to_json method"""
-        return {
-            'token': self.token,
-            'refresh_token': self.refresh_token,
-            'token_uri': self.token_uri,
-            'client_id': self.client_id,
-            'client_secret': self.client_secret,
-            'scopes': self.scopes,
-            'universe_domain': self.universe_domain
-        }
+        """Mock to_json method, returning the dict cached at construction"""
+        return self._json
 
 def create_mock_oauth2_credentials() -> Dict[str, Any]:
     """Create mock OAuth2 credentials for testing"""
@@ -2,15 +2,9 @@
 Mock message structures for testing.
 """
 
-import os
-import sys
 from typing import Dict, Any
 from datetime import datetime
 
-# Add the project root directory to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.append(project_root)
-
 def create_mock_transaction_message(
     amount: float,
     account: str,
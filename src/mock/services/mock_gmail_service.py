@@ -2,14 +2,8 @@
 Mock Gmail service for testing.
 """
 
-import os
-import sys
 import base64
 
-# Add the project root directory to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.append(project_root)
-
 from unittest.mock import MagicMock
 from typing import Dict, Any, Optional
 from src.mock.api.mock_gmail_api import MOCK_MESSAGES
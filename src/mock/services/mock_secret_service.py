@@ -2,16 +2,10 @@
 Mock Secret Manager service for testing.
 """
 
-import os
-import sys
 import json
 from unittest.mock import MagicMock
 from google.api_core import exceptions
 
-# Add the project root directory to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.append(project_root)
-
 def access_secret_version(request):
     """Mock accessing a secret version"""
     # Extract secret ID from path
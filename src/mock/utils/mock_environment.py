@@ -2,14 +2,8 @@
 Mock environment variables for testing.
 """
 
-import os
-import sys
 from typing import Dict, Any, Optional
 
-# Add the project root directory to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.append(project_root)
-
 # Default mock environment variables
 DEFAULT_ENV_VARS = {
     'GOOGLE_CLOUD_PROJECT': '',  # Empty for non-GCP environment
@@ -2,14 +2,8 @@
 Helper functions for testing template matching functionality.
 """
 
-import os
-import sys
 from typing import Dict, Optional
 
-# Add the project root directory to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.append(project_root)
-
 def get_template_patterns(templates: Dict, template_name: str) -> Dict[str, str]:
     """Get patterns for a specific template
     
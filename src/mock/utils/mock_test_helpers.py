@@ -3,15 +3,19 @@ Common test utilities and decorators.
 """
 
 import os
-import sys
+from contextlib import ExitStack
 from functools import wraps
+from types import MappingProxyType
 from unittest.mock import patch, MagicMock
-from typing import Dict, Any, Callable, Optional, Tuple
-
-# Add the project root directory to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.append(project_root)
+from typing import Dict, Any, Callable, List, Optional, Tuple
 
+import google.auth
+import google.oauth2.service_account
+import googleapiclient.discovery
+import src.utils.credentials_manager as credentials_manager
+from src.utils.config import Config
+from src.utils.credentials_manager import CredentialsManager
+from src.utils.test_utils import get_test_user
 from src.mock.models.mock_credentials import (
     create_mock_oauth2_credentials,
     MockServiceAccountCredentials,
@@ -24,6 +28,20 @@ from src.mock.utils.mock_environment import create_mock_env_vars, mock_getenv
 # Re-export unittest.mock utilities
 __all__ = ['mock_credentials', 'get_user_credentials', 'patch', 'MagicMock']
 
+# Mock environment shared by every helper call; read-only so no caller can alter it
+_ENV_VARS = MappingProxyType(create_mock_env_vars())
+_GETENV = mock_getenv(_ENV_VARS)
+
+def _no_default_credentials(*args, **kwargs):
+    raise Exception("No default credentials")
+
+# Fixed (target, patch kwargs) pairs applied by get_user_credentials
+_USER_CREDENTIALS_PATCHES = (
+    ('os.getenv', {'side_effect': _GETENV}),
+    ('google.auth.default', {'side_effect': _no_default_credentials}),
+    ('google.oauth2.service_account.Credentials', {'new': MockServiceAccountCredentials}),
+)
+
 def get_user_credentials(email: str = None, config: Any = None) -> Tuple[str, str, Dict[str, Any]]:
     """Get user credentials for testing
     
@@ -34,10 +52,6 @@ def get_user_credentials(email: str = None, config: Any = None) -> Tuple[str, st
     Returns:
         Tuple of (user_id, email, credentials)
     """
-    from src.utils.config import Config
-    from src.utils.test_utils import get_test_user
-    from src.utils.credentials_manager import CredentialsManager
-    
     if config is None:
         config = Config()
     
@@ -57,25 +71,19 @@ def get_user_credentials(email: str = None, config: Any = None) -> Tuple[str, st
             raise ValueError(f"Account {account_name} not found in config.yaml auth.gmail.accounts")
         user_id = account_config.get('user_id')
     
-    # Create mock credentials
-    mock_creds = create_mock_oauth2_credentials()
-    
-    # Mock environment variables
-    env_vars = create_mock_env_vars()
-    
     # Mock environment and credentials manager
-    with patch.dict(os.environ, env_vars), \
-         patch('os.getenv', side_effect=mock_getenv(env_vars)), \
-         patch('google.auth.default', side_effect=Exception("No default credentials")), \
-         patch('google.oauth2.credentials.Credentials', return_value=MockOAuth2Credentials()), \
-         patch('google.oauth2.service_account.Credentials', MockServiceAccountCredentials), \
-         patch('src.utils.credentials_manager.secretmanager') as mock_secretmanager, \
-         patch('googleapiclient.discovery.build') as mock_build:
+    with ExitStack() as stack:
+        stack.enter_context(patch.dict(os.environ, _ENV_VARS))
+        for target, kwargs in _USER_CREDENTIALS_PATCHES:
+            stack.enter_context(patch(target, **kwargs))
+        stack.enter_context(patch('google.oauth2.credentials.Credentials', return_value=MockOAuth2Credentials()))
         
         # Mock Secret Manager client
+        mock_secretmanager = stack.enter_context(patch('src.utils.credentials_manager.secretmanager'))
         mock_secretmanager.SecretManagerServiceClient.return_value = create_mock_secret_manager_client()
         
         # Mock Gmail service
+        mock_build = stack.enter_context(patch('googleapiclient.discovery.build'))
         mock_build.return_value = create_mock_gmail_service()
         
         # Initialize credentials manager without real service account
@@ -85,38 +93,63 @@ def get_user_credentials(email: str = None, config: Any = None) -> Tuple[str, st
         creds = cred_manager.get_user_gmail_credentials(user_id, email)
         return user_id, email, creds
 
+def _returning(value: Any) -> Callable:
+    """Plain callable standing in for a factory that always returns value"""
+    def factory(*args, **kwargs):
+        return value
+    return factory
+
+def _swap_attributes(replacements: List[Tuple[Any, str, Any]]) -> List[Tuple[Any, str, Any]]:
+    """Assign each (owner, name, value) and return the originals for _restore_attributes"""
+    originals = [(owner, name, getattr(owner, name)) for owner, name, _ in replacements]
+    for owner, name, value in replacements:
+        setattr(owner, name, value)
+    return originals
+
+def _restore_attributes(originals: List[Tuple[Any, str, Any]]):
+    for owner, name, value in reversed(originals):
+        setattr(owner, name, value)
+
 def mock_credentials(func: Callable) -> Callable:
-    """Decorator to mock credentials for testing"""
+    """Decorator to mock credentials for testing
+    
+    Fixed module attributes are swapped and restored directly rather than
+    through stacked patch() context managers; only os.environ uses patch.dict,
+    which also undoes any changes the test makes to it. The mocks are built once
+    per decorated function and have their recorded calls reset on each call.
+    """
+    # Create mock credentials
+    mock_creds = create_mock_oauth2_credentials()
+    
+    # Create a mock credentials instance
+    mock_credentials_instance = MagicMock(**mock_creds)
+    mock_credentials_instance.has_scopes.return_value = True
+    mock_credentials_instance.to_json.return_value = mock_creds
+    
+    # Mock Secret Manager module with its client
+    mock_secretmanager = MagicMock()
+    mock_secretmanager.SecretManagerServiceClient.return_value = create_mock_secret_manager_client()
+    
+    # Mock Gmail service
+    mock_gmail_service = create_mock_gmail_service()
+    
     @wraps(func)
     def wrapper(*args, **kwargs):
-        # Create mock credentials
-        mock_creds = create_mock_oauth2_credentials()
-        
-        # Set up environment variables
-        env_vars = create_mock_env_vars()
-        
-        # Create a mock credentials instance
-        mock_credentials_instance = MagicMock()
-        for key, value in mock_creds.items():
-            setattr(mock_credentials_instance, key, value)
-        mock_credentials_instance.refresh = MagicMock()
-        mock_credentials_instance.has_scopes = MagicMock(return_value=True)
-        mock_credentials_instance.to_json = MagicMock(return_value=mock_creds)
+        for mock in (mock_credentials_instance, mock_secretmanager, mock_gmail_service):
+            mock.reset_mock()
         
-        with patch.dict(os.environ, env_vars), \
-             patch('os.getenv', side_effect=mock_getenv(env_vars)), \
-             patch('google.auth.default', side_effect=Exception("No default credentials")), \
-             patch('src.utils.credentials_manager.Credentials', return_value=mock_credentials_instance), \
-             patch('google.oauth2.service_account.Credentials', MockServiceAccountCredentials), \
-             patch('src.utils.credentials_manager.secretmanager') as mock_secretmanager, \
-             patch('googleapiclient.discovery.build') as mock_build:
-            
-            # Mock Secret Manager client
-            mock_secretmanager.SecretManagerServiceClient.return_value = create_mock_secret_manager_client()
-            
-            # Mock Gmail service
-            mock_build.return_value = create_mock_gmail_service()
-            
-            return func(*args, **kwargs)
+        with patch.dict(os.environ, _ENV_VARS):
+            originals = _swap_attributes([
+                (os, 'getenv', _GETENV),
+                (google.auth, 'default', _no_default_credentials),
+                (credentials_manager, 'Credentials', _returning(mock_credentials_instance)),
+                (google.oauth2.service_account, 'Credentials', MockServiceAccountCredentials),
+                (credentials_manager, 'secretmanager', mock_secretmanager),
+                (googleapiclient.discovery, 'build', _returning(mock_gmail_service)),
+            ])
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _restore_attributes(originals)
     
     return wrapper 
\ No newline at end of file
@@ -1,9 +1,54 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime, timezone
-from src.utils.transaction_dao import TransactionDAO
+import sys
+from src.utils.transaction_dao import clean_vendor
 
-@dataclass
+# Bound once; from_dict and to_dict run per transaction in batch ingest
+_UTC = timezone.utc
+_fromisoformat = datetime.fromisoformat
+# fromisoformat only understands a trailing 'Z' from Python 3.11
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+# Currency symbols and thousands separators stripped from string amounts
+_AMOUNT_STRIP = str.maketrans('', '', '$,')
+# Timestamp fields normalized by from_dict alongside date
+_TIMESTAMP_FIELDS = ('created_at', 'last_modified')
+
+def _to_utc(value):
+    """Return a datetime in UTC, treating naive values as UTC; other values pass through"""
+    if not isinstance(value, datetime):
+        return value
+    tz = value.tzinfo
+    if tz is None:
+        return value.replace(tzinfo=_UTC)
+    return value if tz is _UTC else value.astimezone(_UTC)
+
+def _parse_iso_utc(value: str) -> datetime:
+    """Parse an ISO 8601 string, converting offset-aware results to UTC; naive results stay naive"""
+    if not _FROMISOFORMAT_ACCEPTS_Z:
+        value = value.replace('Z', '+00:00')
+    dt = _fromisoformat(value)
+    tz = dt.tzinfo
+    if tz is not None and tz is not _UTC:
+        dt = dt.astimezone(_UTC)
+    return dt
+
+def _add_slots(cls):
+    """Recreate a dataclass with __slots__ for its fields
+    
+    Equivalent to dataclass(slots=True), which needs Python 3.10 while the
+    service image still runs 3.9. Defaults stay in the generated __init__.
+    """
+    names = tuple(f.name for f in fields(cls))
+    cls_dict = {k: v for k, v in cls.__dict__.items() if k not in names}
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    cls_dict['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+# repr and eq are not generated; nothing compares or logs Transaction objects
+@_add_slots
+@dataclass(repr=False, eq=False)
 class Transaction:
     """Transaction data model"""
     id: str
@@ -29,49 +74,39 @@ class Transaction:
     def from_dict(cls, data: Dict[str, Any]) -> 'Transaction':
         """Create Transaction from dictionary"""
         # Handle date field
-        if hasattr(data['date'], 'toDate'):  # Check if it's a Firestore Timestamp
-            data['date'] = data['date'].toDate().replace(tzinfo=timezone.utc)
-        elif isinstance(data['date'], str):
+        date = data['date']
+        if hasattr(date, 'toDate'):  # Check if it's a Firestore Timestamp
+            data['date'] = date.toDate().replace(tzinfo=_UTC)
+        elif isinstance(date, str):
             # If date doesn't have time info, append UTC midnight time
-            if 'T' not in data['date']:
-                data['date'] = f"{data['date']}T00:00:00Z"
-            # Ensure UTC timezone
-            elif not data['date'].endswith('Z') and '+' not in data['date'] and '-' not in data['date']:
-                data['date'] = f"{data['date']}Z"
-            # Parse with UTC timezone
-            dt = datetime.fromisoformat(data['date'].replace('Z', '+00:00'))
-            # Convert to UTC if it has a different timezone
-            if dt.tzinfo is not None and dt.tzinfo != timezone.utc:
-                dt = dt.astimezone(timezone.utc)
-            data['date'] = dt
-        elif isinstance(data['date'], datetime):
+            if 'T' not in date:
+                date += 'T00:00:00Z'
+            # Ensure UTC timezone; any '-' (a date separator or offset) rules this out,
+            # so that scan runs first and the rest are skipped for ISO dates
+            elif '-' not in date and date[-1] != 'Z' and '+' not in date:
+                date += 'Z'
+            # Parse, converting to UTC if it has a different timezone
+            data['date'] = _parse_iso_utc(date)
+        elif isinstance(date, datetime):
             # Ensure datetime has UTC timezone
-            if data['date'].tzinfo is None:
-                data['date'] = data['date'].replace(tzinfo=timezone.utc)
-            elif data['date'].tzinfo != timezone.utc:
-                data['date'] = data['date'].astimezone(timezone.utc)
+            data['date'] = _to_utc(date)
         
         # Convert amount to float if it's a string
         if isinstance(data['amount'], str):
             # Remove currency symbols and commas
-            amount_str = data['amount'].replace('$', '').replace(',', '')
-            data['amount'] = float(amount_str)
+            data['amount'] = float(data['amount'].translate(_AMOUNT_STRIP))
         
         # Convert timestamps
-        for field in ['created_at', 'last_modified']:
-            if field in data:
-                if hasattr(data[field], 'toDate'):  # Check if it's a Firestore Timestamp
-                    data[field] = data[field].toDate().replace(tzinfo=timezone.utc)
-                elif isinstance(data[field], str):
-                    dt = datetime.fromisoformat(data[field].replace('Z', '+00:00'))
-                    if dt.tzinfo is not None and dt.tzinfo != timezone.utc:
-                        dt = dt.astimezone(timezone.utc)
-                    data[field] = dt
-                elif isinstance(data[field], datetime):
-                    if data[field].tzinfo is None:
-                        data[field] = data[field].replace(tzinfo=timezone.utc)
-                    elif data[field].tzinfo != timezone.utc:
-                        data[field] = data[field].astimezone(timezone.utc)
+        for field in _TIMESTAMP_FIELDS:
+            value = data.get(field)
+            if value is None:
+                continue
+            if hasattr(value, 'toDate'):  # Check if it's a Firestore Timestamp
+                data[field] = value.toDate().replace(tzinfo=_UTC)
+            elif isinstance(value, str):
+                data[field] = _parse_iso_utc(value)
+            elif isinstance(value, datetime):
+                data[field] = _to_utc(value)
         
         # Handle updated_at to last_modified conversion
         if 'updated_at' in data and 'last_modified' not in data:
@@ -89,57 +124,52 @@ class Transaction:
         
         # Handle vendor cleaning fields
         if data.get('vendor') and not data.get('vendor_cleaned'):
-            dao = TransactionDAO(None)  # We don't need project_id for cleaning
-            vendor_data = dao._clean_vendor(data['vendor'])
-            data.update(vendor_data)
+            # Cleaning is stateless, so no DAO (and Firestore client) is created for it
+            data.update(clean_vendor(data['vendor']))
         
         # Handle category to predicted_category conversion
         if 'category' in data and not data.get('predicted_category'):
             data['predicted_category'] = data.pop('category')
         
-        return cls(**data)
+        # The generated __init__ is the cheapest constructor, so pass the data straight
+        # through and only rebuild it without extra keys when some are present
+        if _TRANSACTION_FIELD_SET.issuperset(data):
+            return cls(**data)
+        return cls(**{name: data[name] for name in _TRANSACTION_FIELDS if name in data})
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for storage"""
-        # Ensure all datetime fields are in UTC
-        date = self.date
-        if isinstance(date, datetime):
-            if date.tzinfo is None:
-                date = date.replace(tzinfo=timezone.utc)
-            elif date.tzinfo != timezone.utc:
-                date = date.astimezone(timezone.utc)
+        """Convert to dictionary for storage
         
-        created_at = self.created_at
-        if isinstance(created_at, datetime):
-            if created_at.tzinfo is None:
-                created_at = created_at.replace(tzinfo=timezone.utc)
-            elif created_at.tzinfo != timezone.utc:
-                created_at = created_at.astimezone(timezone.utc)
-        
-        last_modified = self.last_modified
-        if isinstance(last_modified, datetime):
-            if last_modified.tzinfo is None:
-                last_modified = last_modified.replace(tzinfo=timezone.utc)
-            elif last_modified.tzinfo != timezone.utc:
-                last_modified = last_modified.astimezone(timezone.utc)
-        
-        return {
+        Optional fields that are None are left out rather than written as nulls;
+        the DAO reads them with .get().
+        """
+        # Ensure all datetime fields are in UTC
+        data = {
             'id': self.id,
-            'id_api': self.id_api,  # Include Gmail API ID
-            'date': date,  # Let DAO handle conversion to Firestore Timestamp
+            'date': _to_utc(self.date),  # Let DAO handle conversion to Firestore Timestamp
             'description': self.description,
             'amount': self.amount,
             'account_id': self.account_id,
             'user_id': self.user_id,
             'predicted_category': self.predicted_category,
-            'predicted_subcategory': self.predicted_subcategory,
-            'vendor': self.vendor,
-            'vendor_cleaned': self.vendor_cleaned,
-            'cleaned_metaphone': self.cleaned_metaphone,
-            'notes': self.notes,
-            'location': self.location,
             'tags': self.tags or [],
-            'created_at': created_at,  # Let DAO handle conversion to Firestore Timestamp
-            'last_modified': last_modified,  # Let DAO handle conversion to Firestore Timestamp
             'status': self.status
-        } 
\ No newline at end of file
+        }
+        for key, value in (
+            ('id_api', self.id_api),  # Include Gmail API ID
+            ('predicted_subcategory', self.predicted_subcategory),
+            ('vendor', self.vendor),
+            ('vendor_cleaned', self.vendor_cleaned),
+            ('cleaned_metaphone', self.cleaned_metaphone),
+            ('notes', self.notes),
+            ('location', self.location),
+            ('created_at', _to_utc(self.created_at)),  # Let DAO handle conversion to Firestore Timestamp
+            ('last_modified', _to_utc(self.last_modified)),  # Let DAO handle conversion to Firestore Timestamp
+        ):
+            if value is not None:
+                data[key] = value
+        return data
+
+# Field names of the Transaction model, resolved once for from_dict
+_TRANSACTION_FIELDS = tuple(f.name for f in fields(Transaction))
+_TRANSACTION_FIELD_SET = frozenset(_TRANSACTION_FIELDS)
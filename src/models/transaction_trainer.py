@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -22,41 +23,64 @@ import logging
 from datetime import datetime
 
 
-def extract_vendor_features(df):
-    """Extract vendor-specific features as a standalone function"""
+# (substring code, feature column) pairs matched against the lowercased vendor.
+# Several codes can feed one column; each matching code adds 1 to its count.
+VENDOR_PATTERNS = (
+    ('amz', 'amazon'),
+    ('a.mazon', 'amazon'),
+    ('amazon', 'amazon'),
+    ('aramark', 'aramark'),
+    ('jpmc', 'aramark'),
+    ('great clips', 'great_clips'),
+    ('osu', 'ohio_state'),
+    ('ohio state', 'ohio_state'),
+    ('firstma', 'student_loan'),
+    ('mohela', 'student_loan'),
+    ('spirits', 'bar'),
+    ('brewery', 'bar'),
+    ('tavern', 'bar'),
+    ('bar', 'bar'),
+    ('supplement', 'supplements'),
+    ('best buy', 'best_buy'),
+    ('lending', 'loan')
+)
+
+
+def extract_vendor_features(df, inplace=True):
+    """Extract vendor-specific features as a standalone function
+    
+    With inplace=False the input frame is left untouched: only the vendor
+    column is copied, and the flag columns are joined onto the remaining
+    columns without copying them.
+    """
     if isinstance(df, pd.Series):
         df = df.to_frame()
 
     if 'vendor' not in df.columns:
         raise ValueError("The DataFrame does not contain the column 'vendor'")
 
+    if not inplace:
+        features = extract_vendor_features(df[['vendor']].copy())
+        flags = features.drop(columns='vendor')
+        stale = [col for col in flags.columns if col in df.columns]
+        base = df.drop(columns=stale) if stale else df
+        result = pd.concat([base, flags], axis=1, copy=False)
+        result['vendor'] = features['vendor']
+        return result
+
     # Handle null values and convert to string before using str accessor
     df['vendor'] = df['vendor'].fillna('').astype(str).str.lower()
-    
-    vendor_list = [
-        ('amz', 'amazon'),
-        ('a.mazon', 'amazon'),
-        ('amazon', 'amazon'),
-        ('aramark', 'aramark'),
-        ('jpmc', 'aramark'),
-        ('great clips', 'great_clips'),
-        ('osu', 'ohio_state'),
-        ('ohio state', 'ohio_state'),
-        ('firstma', 'student_loan'),
-        ('mohela', 'student_loan'),
-        ('spirits', 'bar'),
-        ('brewery', 'bar'),
-        ('tavern', 'bar'),
-        ('bar', 'bar'),
-        ('supplement', 'supplements'),
-        ('best buy', 'best_buy'),
-        ('lending', 'loan')
-    ]
 
-    for _, vendor_name in vendor_list:
-        df[vendor_name] = 0
-    for vendor_code, vendor_name in vendor_list:
-        df[vendor_name] = df['vendor'].apply(lambda x: vendor_code in str(x) if x else False).astype(int) + df[vendor_name]
+    # Vendors repeat heavily, so match each distinct value once and broadcast
+    # the hits back to rows; counts accumulate as arrays and each column is
+    # written once instead of once per vendor code
+    row_codes, uniques = pd.factorize(df['vendor'])
+    flags = {vendor_name: 0 for _, vendor_name in VENDOR_PATTERNS}
+    for vendor_code, vendor_name in VENDOR_PATTERNS:
+        hits = np.fromiter((vendor_code in v for v in uniques), dtype=int, count=len(uniques))
+        flags[vendor_name] = flags[vendor_name] + hits[row_codes]
+    for vendor_name, counts in flags.items():
+        df[vendor_name] = counts
     return df
 
     
@@ -243,8 +267,8 @@ class TransactionModelTrainer:
         pipeline = self.create_pipeline()
         
         # Apply vendor feature extraction before training
-        train_df = extract_vendor_features(train_df.copy())
-        test_df = extract_vendor_features(test_df.copy())
+        train_df = extract_vendor_features(train_df, inplace=False)
+        test_df = extract_vendor_features(test_df, inplace=False)
         
         # Prepare features and labels - include vendor features
         text_columns = ['vendor', 'vendor_cleaned', 'cleaned_metaphone',
@@ -1,15 +1,22 @@
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Optional
+import cachetools
 import joblib
 from google.cloud import storage
 import logging
+import threading
 from datetime import datetime
 import calendar
 import re
 from metaphone import doublemetaphone
 from sklearn.feature_extraction.text import TfidfVectorizer
-from src.models.transaction_trainer import extract_vendor_features
+from src.models.transaction_trainer import VENDOR_PATTERNS, extract_vendor_features
+
+
+# Transaction fields that determine the engineered features of a single transaction
+_TRANSFORM_KEY_FIELDS = ('vendor', 'description', 'date', 'template_used', 'account')
+_MISSING = object()
 
 
 class FeatureEngineer:
@@ -30,26 +37,13 @@ class FeatureEngineer:
             'template_used', 'account', 'day', 'month', 'year', 'day_name'
         ]
         
-        # Vendor patterns for feature extraction
-        self.vendor_patterns = [
-            ('amz', 'amazon'),
-            ('a.mazon', 'amazon'),
-            ('amazon', 'amazon'),
-            ('aramark', 'aramark'),
-            ('jpmc', 'aramark'),
-            ('great clips', 'great_clips'),
-            ('osu', 'ohio_state'),
-            ('ohio state', 'ohio_state'),
-            ('firstma', 'student_loan'),
-            ('mohela', 'student_loan'),
-            ('spirits', 'bar'),
-            ('brewery', 'bar'),
-            ('tavern', 'bar'),
-            ('bar', 'bar'),
-            ('supplement', 'supplements'),
-            ('best buy', 'best_buy'),
-            ('lending', 'loan')
-        ]
+        # Vendor patterns for feature extraction (shared with training)
+        self.vendor_patterns = VENDOR_PATTERNS
+        
+        # Features of recently transformed single transactions; LRUCache reorders
+        # entries on every lookup, so all access goes through the lock
+        self.transform_cache = cachetools.LRUCache(maxsize=1024)
+        self._transform_cache_lock = threading.Lock()
         
         # Load model artifacts if available
         self.tfidf_vectorizers = {}
@@ -78,8 +72,28 @@ class FeatureEngineer:
             self.logger.warning(f"Could not load model artifacts: {e}")
     
     def transform_transaction(self, transaction: Dict[str, Any]) -> pd.DataFrame:
-        """Transform a single transaction into model features"""
-        return self.transform_transactions([transaction])
+        """Transform a single transaction into model features
+        
+        Results are cached by the fields the features depend on; transactions
+        without a date are not cached since they use the current date.
+        """
+        if 'date' not in transaction:
+            return self.transform_transactions([transaction])
+        
+        cache_key = tuple(transaction.get(field, _MISSING) for field in _TRANSFORM_KEY_FIELDS)
+        try:
+            with self._transform_cache_lock:
+                features = self.transform_cache.get(cache_key)
+        except TypeError:
+            # Unhashable field values; skip caching
+            return self.transform_transactions([transaction])
+        
+        if features is None:
+            features = self.transform_transactions([transaction])
+            with self._transform_cache_lock:
+                self.transform_cache[cache_key] = features
+        
+        return features.copy()
     
     def transform_transactions(self, transactions: List[Dict[str, Any]]) -> pd.DataFrame:
         """Transform multiple transactions into model features"""
@@ -6,6 +6,11 @@ import logging
 import base64
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Set up logging with more detailed format
 log_level = os.getenv('LOG_LEVEL', 'INFO')
 logging.basicConfig(
@@ -27,6 +32,15 @@ headers = {
     'Content-Type': 'application/json'
 }
 
+def _pretty_json(data: Any) -> str:
+    """Indent data as JSON for the logs, with orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            pass  # e.g. non-string keys; the stdlib encoder handles those
+    return json.dumps(data, indent=2)
+
 @functions_framework.cloud_event
 def process_transactions(cloud_event):
     """Cloud Function entry point for Pub/Sub trigger"""
@@ -47,7 +61,8 @@ def process_transactions(cloud_event):
                     # Parse and log the message data
                     try:
                         data = json.loads(message_data)
-                        logger.info(f"Parsed message data: {json.dumps(data, indent=2)}")
+                        if logger.isEnabledFor(logging.INFO):
+                            logger.info(f"Parsed message data: {_pretty_json(data)}")
                         
                         # Special handling for test messages
                         if isinstance(data, dict) and data.get('test'):
@@ -141,7 +156,8 @@ def process_transactions(cloud_event):
             results = service.trigger_individual_user_processing()
         
         # Log the results
-        logger.info(f"Processing completed with results: {json.dumps(results, indent=2)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Processing completed with results: {_pretty_json(results)}")
         logger.info("=== END PROCESSING PUBSUB MESSAGE ===")
         return json.dumps(results)
         
@@ -7,6 +7,9 @@ from src.utils.transaction_parser import TransactionParser
 class GmailUtil:
     """Utility for interacting with Gmail API"""
     
+    # Maximum number of calls Gmail accepts in one batch request
+    BATCH_SIZE = 100
+    
     def __init__(self, credentials: Dict[str, Any]):
         """Initialize Gmail API client with OAuth2 credentials"""
         self.config = Config()
@@ -33,6 +36,27 @@ class GmailUtil:
                 return header['value'].strip('<>').strip()
         return gmail_id
     
+    def _get_full_messages(self, gmail_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch full message details for the given Gmail IDs using batch requests"""
+        fetched = {}
+        
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                self.logger.warning(f"Failed to fetch message {request_id}: {exception}")
+            else:
+                fetched[request_id] = response
+        
+        for start in range(0, len(gmail_ids), self.BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for gmail_id in gmail_ids[start:start + self.BATCH_SIZE]:
+                batch.add(
+                    self.service.users().messages().get(userId='me', id=gmail_id, format='full'),
+                    request_id=gmail_id
+                )
+            batch.execute()
+        
+        return fetched
+    
     def fetch_transaction_emails(self, query: str) -> List[Tuple[Dict[str, Any], str]]:
         """Fetch transaction emails from Gmail"""
         try:
@@ -45,18 +69,18 @@ class GmailUtil:
             messages = response.get('messages', [])
             self.logger.info(f"Found {len(messages)} messages matching query")
             
+            # Get full message details in batched requests
+            full_messages = self._get_full_messages([message['id'] for message in messages])
+            
             results = []
             for message in messages:
                 gmail_id = message['id']
+                msg = full_messages.get(gmail_id)
+                if msg is None:
+                    # Fetch failure was already logged; skip this message
+                    continue
                 self.logger.info(f"Processing message {gmail_id}")
                 
-                # Get full message details
-                msg = self.service.users().messages().get(
-                    userId='me',
-                    id=gmail_id,
-                    format='full'
-                ).execute()
-                
                 # Get the original Message-ID from headers
                 headers = msg['payload']['headers']
                 message_id = self._get_message_id(headers, gmail_id)
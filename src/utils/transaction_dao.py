@@ -7,6 +7,21 @@ import re
 from metaphone import doublemetaphone
 import calendar
 
+def clean_vendor(vendor: str) -> Dict[str, Any]:
+    """Clean vendor name and generate metaphone code"""
+    # Remove special characters and convert to lowercase
+    cleaned = re.sub('[^A-Za-z ]+', ' ', vendor.lower())
+    # Remove multiple spaces
+    cleaned = re.sub(' +', ' ', cleaned).strip()
+    # Generate both metaphone codes
+    primary, secondary = doublemetaphone(cleaned) if cleaned else (None, None)
+    # Create array of metaphone codes, filtering out None values
+    metaphone_codes = [code for code in [primary, secondary] if code]
+    return {
+        'vendor_cleaned': cleaned,
+        'cleaned_metaphone': metaphone_codes
+    }
+
 class TransactionDAO:
     """Data Access Object for transaction operations"""
     
@@ -17,18 +32,7 @@ class TransactionDAO:
     
     def _clean_vendor(self, vendor: str) -> Dict[str, str]:
         """Clean vendor name and generate metaphone code"""
-        # Remove special characters and convert to lowercase
-        cleaned = re.sub('[^A-Za-z ]+', ' ', vendor.lower())
-        # Remove multiple spaces
-        cleaned = re.sub(' +', ' ', cleaned).strip()
-        # Generate both metaphone codes
-        primary, secondary = doublemetaphone(cleaned) if cleaned else (None, None)
-        # Create array of metaphone codes, filtering out None values
-        metaphone_codes = [code for code in [primary, secondary] if code]
-        return {
-            'vendor_cleaned': cleaned,
-            'cleaned_metaphone': metaphone_codes
-        }
+        return clean_vendor(vendor)
     
     def _get_date_components(self, dt: datetime) -> Dict[str, Any]:
         """Extract date components from datetime object"""
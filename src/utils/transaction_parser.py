@@ -8,8 +8,38 @@ from zoneinfo import ZoneInfo
 import platform
 import html
 from email.utils import parsedate_to_datetime
+import functools
 import quopri  # Added import for quoted-printable decoding
 
+# Patterns used by TransactionParser._sanitize_body, compiled once at import
+_SCRIPT_RE = re.compile(r'<script.*?>.*?</script>', re.DOTALL | re.IGNORECASE)
+_STYLE_RE = re.compile(r'<style.*?>.*?</style>', re.DOTALL | re.IGNORECASE)
+_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+_ENTITY_RE = re.compile(r'&[a-zA-Z0-9#]+;')
+_NON_PRINTABLE_RE = re.compile(r'[^\x20-\x7E\n]')
+
+@functools.lru_cache(maxsize=512)
+def _template_regex(pattern: str) -> re.Pattern:
+    """Compile a template pattern once, with the flags used for template matching"""
+    return re.compile(pattern, re.IGNORECASE | re.DOTALL)
+
+def _header_values(headers: List[Dict[str, str]], *names: str) -> Dict[str, str]:
+    """Collect only the named header values in one pass over the header list.
+    
+    Later headers win, as they would in a dict built from the whole list, and the
+    scan stops once every requested header has been seen.
+    """
+    found = {}
+    for header in reversed(headers):
+        name = header['name']
+        if name in names and name not in found:
+            found[name] = header['value']
+            if len(found) == len(names):
+                break
+    return found
+
 class TransactionParser:
     """Parses transaction data from various sources"""
     
@@ -315,7 +345,7 @@ class TransactionParser:
             gmail_id = message.get('gmail_id')  # Gmail API ID
             
             # Log message details (concise version)
-            header_dict = {h['name']: h['value'] for h in headers}
+            header_dict = _header_values(headers, 'Subject', 'From', 'Date')
             subject = header_dict.get('Subject', 'N/A')
             from_addr = header_dict.get('From', 'N/A')
             
@@ -375,29 +405,31 @@ class TransactionParser:
         # Decode quoted-printable first to handle soft breaks
         body = quopri.decodestring(body.encode('utf-8')).decode('utf-8', errors='replace')
             
-        # Remove script tags and content
-        body = re.sub(r'<script.*?>.*?</script>', '', body, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Remove style tags and content
-        body = re.sub(r'<style.*?>.*?</style>', '', body, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Remove all HTML comments
-        body = re.sub(r'<!--.*?-->', '', body, flags=re.DOTALL)
-        
-        # Remove all other HTML tags but preserve their content
-        body = re.sub(r'<[^>]+>', ' ', body)
+        # Plain-text bodies have no markup to strip
+        if '<' in body:
+            # Remove script tags and content
+            body = _SCRIPT_RE.sub('', body)
+            
+            # Remove style tags and content
+            body = _STYLE_RE.sub('', body)
+            
+            # Remove all HTML comments
+            body = _COMMENT_RE.sub('', body)
+            
+            # Remove all other HTML tags but preserve their content
+            body = _TAG_RE.sub(' ', body)
         
         # Replace multiple spaces/newlines with single space
-        body = re.sub(r'\s+', ' ', body)
+        body = _WHITESPACE_RE.sub(' ', body)
         
         # Decode HTML entities (e.g. ’ -> ', / -> /,   -> space)
         body = html.unescape(body)
         
         # Remove any remaining HTML-like artifacts
-        body = re.sub(r'&[a-zA-Z0-9#]+;', '', body)
+        body = _ENTITY_RE.sub('', body)
         
         # Clean up any remaining special characters
-        body = re.sub(r'[^\x20-\x7E\n]', '', body)
+        body = _NON_PRINTABLE_RE.sub('', body)
         
         # Trim extra whitespace
         body = body.strip()
@@ -424,51 +456,14 @@ class TransactionParser:
                             data = ''.join(str(d) for d in data if d and str(d).strip())
                         yield data
         
-        # 1) Initialize a fallback raw_body (in case there's no HTML at all)
+        # 1) Gather all text/html parts, recursively; decoded HTML takes precedence,
+        #    so the plain-text fallbacks below are only decoded when there is none
         raw_body = ''
-        
-        # 2) If top-level has 'body' data (single-part), decode it
-        body_data = payload.get('body', {}).get('data')
-        if body_data:
-            try:
-                # Handle case where data might be a list
-                if isinstance(body_data, list):
-                    # Join all non-empty elements into a single string
-                    body_data = ''.join(str(d) for d in body_data if d and str(d).strip())
-                raw_body = base64.urlsafe_b64decode(body_data).decode('utf-8', errors='replace')
-            except Exception as e:
-                self.logger.error(f"Failed to decode top-level body: {str(e)}")
-                self.logger.error(f"Body data type: {type(body_data)}")
-                if isinstance(body_data, (str, bytes)):
-                    self.logger.error(f"Body data length: {len(body_data)}")
-                    self.logger.error(f"Body data sample: {str(body_data[:100])}")
-        
-        # 3) If it's multipart, we can also look for text/plain as a fallback
-        elif 'parts' in payload:
-            for part in payload['parts']:
-                if part.get('mimeType') == 'text/plain' and part.get('body', {}).get('data'):
-                    try:
-                        part_data = part['body']['data']
-                        # Handle case where data might be a list
-                        if isinstance(part_data, list):
-                            # Join all non-empty elements into a single string
-                            part_data = ''.join(str(d) for d in part_data if d and str(d).strip())
-                        raw_body = base64.urlsafe_b64decode(part_data).decode('utf-8', errors='replace')
-                        break
-                    except Exception as e:
-                        self.logger.error(f"Failed to decode text/plain part: {str(e)}")
-                        self.logger.error(f"Part data type: {type(part_data)}")
-                        if isinstance(part_data, (str, bytes)):
-                            self.logger.error(f"Part data length: {len(part_data)}")
-                            self.logger.error(f"Part data sample: {str(part_data[:100])}")
-                        continue
-        
-        # 4) Now gather all text/html parts, recursively
+        decoded_all_html = []
         html_parts = list(find_html_parts(payload))
 
         if html_parts:
             # Decode each HTML part and concatenate them
-            decoded_all_html = []
             for encoded_html in html_parts:
                 try:
                     # Handle case where data might be a list
@@ -489,7 +484,45 @@ class TransactionParser:
             if decoded_all_html:
                 raw_body = "\n\n".join(decoded_all_html)
 
-        # 5) Sanitize the combined raw_body however you like
+        # Without decodable HTML, fall back to the plain body
+        if not decoded_all_html:
+            # 2) If top-level has 'body' data (single-part), decode it
+            body_data = payload.get('body', {}).get('data')
+            if body_data:
+                try:
+                    # Handle case where data might be a list
+                    if isinstance(body_data, list):
+                        # Join all non-empty elements into a single string
+                        body_data = ''.join(str(d) for d in body_data if d and str(d).strip())
+                    raw_body = base64.urlsafe_b64decode(body_data).decode('utf-8', errors='replace')
+                except Exception as e:
+                    self.logger.error(f"Failed to decode top-level body: {str(e)}")
+                    self.logger.error(f"Body data type: {type(body_data)}")
+                    if isinstance(body_data, (str, bytes)):
+                        self.logger.error(f"Body data length: {len(body_data)}")
+                        self.logger.error(f"Body data sample: {str(body_data[:100])}")
+
+            # 3) If it's multipart, fall back to the first text/plain part
+            elif 'parts' in payload:
+                for part in payload['parts']:
+                    if part.get('mimeType') == 'text/plain' and part.get('body', {}).get('data'):
+                        try:
+                            part_data = part['body']['data']
+                            # Handle case where data might be a list
+                            if isinstance(part_data, list):
+                                # Join all non-empty elements into a single string
+                                part_data = ''.join(str(d) for d in part_data if d and str(d).strip())
+                            raw_body = base64.urlsafe_b64decode(part_data).decode('utf-8', errors='replace')
+                            break
+                        except Exception as e:
+                            self.logger.error(f"Failed to decode text/plain part: {str(e)}")
+                            self.logger.error(f"Part data type: {type(part_data)}")
+                            if isinstance(part_data, (str, bytes)):
+                                self.logger.error(f"Part data length: {len(part_data)}")
+                                self.logger.error(f"Part data sample: {str(part_data[:100])}")
+                            continue
+
+        # 4) Sanitize the combined raw_body however you like
         sanitized_body = self._sanitize_body(raw_body)
 
         return (sanitized_body, raw_body)
@@ -535,7 +568,7 @@ class TransactionParser:
     def _find_matching_template(self, headers: List[Dict[str, str]], body: str, raw_body: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
         """Find a matching template for the message by checking both raw and sanitized body"""
         # Convert headers to dict for easier access
-        header_dict = {h['name']: h['value'] for h in headers}
+        header_dict = _header_values(headers, 'Subject', 'From')
         subject = header_dict.get('Subject', '')
         from_addr = header_dict.get('From', '')
         
@@ -553,7 +586,7 @@ class TransactionParser:
                 
                 # Check if subject matches if specified
                 if template.get('subject_pattern'):
-                    subject_match = re.search(template['subject_pattern'], subject, re.IGNORECASE | re.DOTALL)
+                    subject_match = _template_regex(template['subject_pattern']).search(subject)
                     if not subject_match:
                         self.logger.debug(f"❌  Skipping - subject_pattern doesn't match")
                         continue
@@ -577,7 +610,7 @@ class TransactionParser:
                     
                     # For templates with iterate_results=True, handle differently
                     if template.get('iterate_results', False):
-                        cells = re.findall(template['account'], current_body, re.IGNORECASE | re.DOTALL)
+                        cells = _template_regex(template['account']).findall(current_body)
                         if cells:
                             matches['cells'] = cells
                             self.logger.debug(f"✓  Found matching cells in {body_type} body")
@@ -587,12 +620,14 @@ class TransactionParser:
                     has_matches = False
                     matches_found = {}
                     
+                    # Each field only needs its first match, so search rather than
+                    # collecting every match in the body
                     # Try amount pattern
                     if template.get('amount'):
-                        amount_matches = list(re.finditer(template['amount'], current_body, re.IGNORECASE | re.DOTALL))
-                        if amount_matches:
+                        amount_match = _template_regex(template['amount']).search(current_body)
+                        if amount_match:
                             has_matches = True
-                            matches_found['amount'] = amount_matches[0].group(1) if amount_matches[0].groups() else amount_matches[0].group(0)
+                            matches_found['amount'] = amount_match.group(1) if amount_match.groups() else amount_match.group(0)
                             self.logger.debug(f"✓  Amount found in {body_type} body: {matches_found['amount']}")
                         else:
                             self.logger.debug(f"❌  Amount not found in {body_type} body - Pattern: {template['amount']}")
@@ -602,11 +637,11 @@ class TransactionParser:
                         if isinstance(template['vendor'], str):
                             if template['vendor'].startswith('(?') or template['vendor'].startswith('(.*?)'):
                                 # It's a regex pattern
-                                vendor_matches = list(re.finditer(template['vendor'], current_body, re.IGNORECASE | re.DOTALL))
-                                if vendor_matches:
+                                vendor_match = _template_regex(template['vendor']).search(current_body)
+                                if vendor_match:
                                     has_matches = True
                                     # Try each group until we find a non-empty one
-                                    groups = vendor_matches[0].groups()
+                                    groups = vendor_match.groups()
                                     vendor = next((g.strip() for g in groups if g), None)
                                     if vendor:
                                         matches_found['vendor'] = vendor
@@ -615,15 +650,15 @@ class TransactionParser:
                                     self.logger.debug(f"❌  Vendor not found in {body_type} body - Pattern: {template['vendor']}")
                             elif template['vendor'].startswith('Merchant'):
                                 # Special handling for Merchant pattern
-                                vendor_matches = list(re.finditer(template['vendor'], current_body, re.IGNORECASE | re.DOTALL))
-                                if vendor_matches:
+                                vendor_match = _template_regex(template['vendor']).search(current_body)
+                                if vendor_match:
                                     has_matches = True
                                     # Get the first group if it exists, otherwise get the full match
-                                    vendor = vendor_matches[0].group(1) if vendor_matches[0].groups() else vendor_matches[0].group(0)
+                                    vendor = vendor_match.group(1) if vendor_match.groups() else vendor_match.group(0)
                                     if vendor:
                                         matches_found['vendor'] = vendor.strip()
                                         self.logger.debug(f"✓  Vendor found in {body_type} body: {matches_found['vendor']}")
-                                        self.logger.debug(f"Full vendor match: {vendor_matches[0].group(0)}")
+                                        self.logger.debug(f"Full vendor match: {vendor_match.group(0)}")
                                 else:
                                     self.logger.debug(f"❌  Vendor not found in {body_type} body - Pattern: {template['vendor']}")
                             else:
@@ -634,19 +669,19 @@ class TransactionParser:
                     
                     # Try account pattern
                     if template.get('account'):
-                        account_matches = list(re.finditer(template['account'], current_body, re.IGNORECASE | re.DOTALL))
-                        if account_matches:
+                        account_match = _template_regex(template['account']).search(current_body)
+                        if account_match:
                             has_matches = True
-                            matches_found['account'] = account_matches[0].group(1) if account_matches[0].groups() else account_matches[0].group(0)
+                            matches_found['account'] = account_match.group(1) if account_match.groups() else account_match.group(0)
                             self.logger.debug(f"✓  Account found in {body_type} body: {matches_found['account']}")
                         else:
                             self.logger.debug(f"❌  Account not found in {body_type} body - Pattern: {template['account']}")
                     
                     # Try date pattern
                     if template.get('date'):
-                        date_matches = list(re.finditer(template['date'], current_body, re.IGNORECASE | re.DOTALL))
-                        if date_matches:
-                            matches_found['date'] = date_matches[0].group(1) if date_matches[0].groups() else date_matches[0].group(0)
+                        date_match = _template_regex(template['date']).search(current_body)
+                        if date_match:
+                            matches_found['date'] = date_match.group(1) if date_match.groups() else date_match.group(0)
                             self.logger.debug(f"✓  Date found in {body_type} body: {matches_found['date']}")
                         else:
                             self.logger.debug(f"❌  Date not found in {body_type} body - Pattern: {template['date']}")
@@ -686,7 +721,7 @@ class TransactionParser:
         found_matches = matches.get('found', {})
         
         # Get email date from headers
-        header_dict = {h['name']: h['value'] for h in matches.get('headers', [])}
+        header_dict = _header_values(matches.get('headers', []), 'Date')
         email_date = header_dict.get('Date')
         if email_date:
                     parsed_email_date = self._parse_date(email_date,email_date)
@@ -744,7 +779,7 @@ class TransactionParser:
             elif template.get('subject_vendor'):
                 # Try to get vendor from subject if not found in body
                 subject = matches.get('subject', '')
-                subject_vendor_match = re.search(template['subject_vendor'], subject, re.IGNORECASE | re.DOTALL)
+                subject_vendor_match = _template_regex(template['subject_vendor']).search(subject)
                 if subject_vendor_match:
                     merchant = subject_vendor_match.group(1).strip()
                     self.logger.debug(f"Found vendor from subject: {merchant}")
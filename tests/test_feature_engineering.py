@@ -0,0 +1,93 @@
+"""Tests for the single-transaction feature cache in src.services.feature_engineering."""
+
+import sys
+import unittest
+from unittest.mock import patch
+
+from src.services import feature_engineering
+from src.services.feature_engineering import FeatureEngineer
+
+# test_transaction_ingest_function replaces pandas, numpy and friends in
+# sys.modules with mocks when it is collected; pandas imports some of its
+# internals lazily, so these tests put the real modules back while they run
+_REAL_MODULES = dict(sys.modules)
+
+
+class TestTransformCache(unittest.TestCase):
+    """transform_transaction must only reuse features of an identical transaction"""
+
+    def setUp(self):
+        modules = patch.dict(sys.modules, _REAL_MODULES)
+        modules.start()
+        self.addCleanup(modules.stop)
+
+        with patch.object(feature_engineering.storage, 'Client'):
+            self.engineer = FeatureEngineer('test-project')
+        transform = patch.object(self.engineer, 'transform_transactions',
+                                 wraps=self.engineer.transform_transactions)
+        self.transform_transactions = transform.start()
+        self.addCleanup(transform.stop)
+
+        self.transaction = {
+            'vendor': 'Amazon Marketplace',
+            'description': 'AMAZON MKTPL',
+            'date': '2025-01-02',
+            'template_used': 'chase_credit',
+            'account': '1234',
+            'amount': 12.5,
+        }
+
+    def test_repeated_transaction_is_served_from_cache(self):
+        first = self.engineer.transform_transaction(self.transaction)
+        second = self.engineer.transform_transaction(dict(self.transaction, amount=99.0))
+
+        self.assertEqual(self.transform_transactions.call_count, 1)
+        self.assertTrue(first.equals(second))
+        self.assertEqual(first.loc[0, 'amazon'], 1)
+
+    def test_cached_features_are_not_shared_with_callers(self):
+        self.engineer.transform_transaction(self.transaction)['vendor'] = 'changed'
+
+        features = self.engineer.transform_transaction(self.transaction)
+
+        self.assertEqual(features.loc[0, 'vendor'], 'amazon marketplace')
+
+    def test_key_covers_every_feature_field(self):
+        self.engineer.transform_transaction(self.transaction)
+        variants = {
+            'vendor': 'Best Buy',
+            'description': 'BEST BUY 123',
+            'date': '2025-03-04',
+            'template_used': 'discover_credit',
+            'account': '9876',
+        }
+
+        for field, value in variants.items():
+            with self.subTest(field=field):
+                calls = self.transform_transactions.call_count
+                self.engineer.transform_transaction(dict(self.transaction, **{field: value}))
+                self.assertEqual(self.transform_transactions.call_count, calls + 1)
+
+        self.assertEqual(set(variants), set(feature_engineering._TRANSFORM_KEY_FIELDS))
+
+    def test_missing_field_is_not_confused_with_none(self):
+        self.engineer.transform_transaction(dict(self.transaction, account=None))
+        without_account = dict(self.transaction)
+        del without_account['account']
+
+        self.engineer.transform_transaction(without_account)
+
+        self.assertEqual(self.transform_transactions.call_count, 2)
+
+    def test_transaction_without_date_is_not_cached(self):
+        del self.transaction['date']
+
+        self.engineer.transform_transaction(self.transaction)
+        self.engineer.transform_transaction(self.transaction)
+
+        self.assertEqual(self.transform_transactions.call_count, 2)
+        self.assertEqual(len(self.engineer.transform_cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
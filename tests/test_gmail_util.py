@@ -0,0 +1,77 @@
+"""Tests for batched message fetching in src.utils.gmail_util."""
+
+import unittest
+from unittest.mock import patch
+
+from src.utils.gmail_util import GmailUtil
+
+
+class _FakeBatch:
+    """Batch request that answers each added call through the batch callback"""
+
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.request_ids = []
+
+    def add(self, request, request_id):
+        self.request_ids.append(request_id)
+
+    def execute(self):
+        self.service.batches.append(self.request_ids)
+        for request_id in self.request_ids:
+            if request_id in self.service.failing_ids:
+                self.callback(request_id, None, Exception('404 Not Found'))
+            else:
+                self.callback(request_id, {'id': request_id}, None)
+
+
+class _FakeGmailService:
+    """Gmail service exposing only what _get_full_messages uses"""
+
+    def __init__(self, failing_ids=()):
+        self.failing_ids = set(failing_ids)
+        self.batches = []
+
+    def new_batch_http_request(self, callback):
+        return _FakeBatch(self, callback)
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def get(self, userId, id, format):
+        return (userId, id, format)
+
+
+class TestGetFullMessages(unittest.TestCase):
+
+    def make_gmail_util(self, service):
+        with patch('src.utils.gmail_util.build', return_value=service), \
+             patch('src.utils.gmail_util.Config'):
+            return GmailUtil({'oauth2_credentials': object(), 'email': 'user@example.com'})
+
+    def test_failed_callback_is_skipped(self):
+        gmail_util = self.make_gmail_util(_FakeGmailService(failing_ids={'m2'}))
+
+        with self.assertLogs('src.utils.gmail_util', level='WARNING') as logs:
+            fetched = gmail_util._get_full_messages(['m1', 'm2', 'm3'])
+
+        self.assertEqual(fetched, {'m1': {'id': 'm1'}, 'm3': {'id': 'm3'}})
+        self.assertIn('Failed to fetch message m2', logs.output[0])
+
+    def test_ids_are_split_into_batches(self):
+        service = _FakeGmailService()
+        gmail_util = self.make_gmail_util(service)
+
+        with patch.object(GmailUtil, 'BATCH_SIZE', 2):
+            fetched = gmail_util._get_full_messages(['m1', 'm2', 'm3'])
+
+        self.assertEqual(service.batches, [['m1', 'm2'], ['m3']])
+        self.assertEqual(list(fetched), ['m1', 'm2', 'm3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
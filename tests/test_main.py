@@ -0,0 +1,56 @@
+"""Tests for the orjson-backed Flask JSON provider in src.main."""
+
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from flask import Flask, jsonify
+
+import src.main as main
+
+
+@unittest.skipIf(main.orjson is None, "orjson is not installed")
+class TestOrjsonProvider(unittest.TestCase):
+    """OrjsonProvider must serve jsonify responses through orjson"""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.json = main.OrjsonProvider(self.app)
+
+    def test_jsonify_is_encoded_by_orjson(self):
+        with self.app.app_context(), \
+             patch.object(main.orjson, 'dumps', wraps=main.orjson.dumps) as mock_dumps:
+            response = jsonify({'b': 1, 'a': 'café'})
+
+        self.assertEqual(mock_dumps.call_count, 1)
+        self.assertEqual(response.get_json(), {'b': 1, 'a': 'café'})
+        # Keys keep insertion order and the output is compact
+        self.assertEqual(response.get_data(as_text=True), '{"b":1,"a":"café"}\n')
+
+    def test_datetimes_match_default_provider(self):
+        value = {'date': datetime(2025, 1, 2, 6, 33, 33, tzinfo=timezone.utc)}
+        with self.app.app_context():
+            body = jsonify(value).get_json()
+
+        self.assertEqual(body, {'date': 'Thu, 02 Jan 2025 06:33:33 GMT'})
+
+    def test_debug_output_falls_back_to_indented_stdlib(self):
+        self.app.debug = True
+        with self.app.app_context(), \
+             patch.object(main.orjson, 'dumps', wraps=main.orjson.dumps) as mock_dumps:
+            response = jsonify({'a': 1})
+
+        mock_dumps.assert_not_called()
+        self.assertEqual(response.get_data(as_text=True), '{\n  "a": 1\n}\n')
+
+    def test_sort_keys_is_honoured(self):
+        with self.app.app_context():
+            self.assertEqual(self.app.json.dumps({'b': 1, 'a': 2}, sort_keys=True), '{"a":2,"b":1}')
+
+    def test_loads_round_trip(self):
+        self.assertEqual(self.app.json.loads(b'{"transactions": [{"amount": 1.5}]}'),
+                         {'transactions': [{'amount': 1.5}]})
+
+
+if __name__ == '__main__':
+    unittest.main()
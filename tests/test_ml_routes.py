@@ -0,0 +1,234 @@
+"""Tests for the ML prediction routes in src.api.ml_routes."""
+
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+from src.api import ml_routes
+
+
+class MLRoutesTestCase(unittest.TestCase):
+    """Blueprint on a bare Flask app with the ML services replaced by mocks"""
+
+    @classmethod
+    def setUpClass(cls):
+        ml_routes.init_services('test-project')
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.register_blueprint(ml_routes.ml_bp)
+        self.client = self.app.test_client()
+
+        self.prediction_service = MagicMock()
+        self.prediction_service.get_current_model_version.return_value = 'v1'
+        self.prediction_service.predict_categories.side_effect = (
+            lambda transactions: [{'category': t.get('vendor')} for t in transactions]
+        )
+        services = patch.dict(ml_routes._services, {'pred': self.prediction_service})
+        services.start()
+        self.addCleanup(services.stop)
+
+    def post_predict(self, transactions, client=None):
+        return (client or self.client).post('/api/v1/ml/predict', json={'transactions': transactions})
+
+
+class TestPredictBatching(MLRoutesTestCase):
+    """Coalesced /predict requests must only ever see their own predictions"""
+
+    def post_concurrently(self, *requests):
+        responses = [None] * len(requests)
+
+        def post(index):
+            responses[index] = self.post_predict(requests[index], client=self.app.test_client())
+
+        # Widen the batching window so both requests land in the same batch
+        with patch.object(ml_routes, 'PREDICT_MAX_WAIT_MS', 500):
+            threads = [threading.Thread(target=post, args=(i,)) for i in range(len(requests))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=10)
+        return responses
+
+    def test_concurrent_requests_are_batched_and_scattered(self):
+        first, second = self.post_concurrently([{'vendor': 'a'}], [{'vendor': 'b'}, {'vendor': 'c'}])
+
+        self.assertEqual(self.prediction_service.predict_categories.call_count, 1)
+        self.assertEqual(first.get_json()['predictions'], [{'category': 'a'}])
+        self.assertEqual(second.get_json()['predictions'], [{'category': 'b'}, {'category': 'c'}])
+
+    def test_short_result_is_not_scattered_across_requests(self):
+        def predict(transactions):
+            if len(transactions) == 3:
+                # The coalesced batch comes back one prediction short
+                return [{'category': 'shifted'}] * 2
+            if transactions[0]['vendor'] == 'bad':
+                return []
+            return [{'category': t['vendor']} for t in transactions]
+
+        self.prediction_service.predict_categories.side_effect = predict
+
+        good, bad = self.post_concurrently([{'vendor': 'a'}], [{'vendor': 'bad'}, {'vendor': 'bad'}])
+
+        batch_sizes = [len(c.args[0]) for c in self.prediction_service.predict_categories.call_args_list]
+        # One coalesced call, then each request on its own (in arrival order)
+        self.assertEqual(batch_sizes[0], 3)
+        self.assertEqual(sorted(batch_sizes[1:]), [1, 2])
+        self.assertEqual(good.status_code, 200)
+        self.assertEqual(good.get_json()['predictions'], [{'category': 'a'}])
+        self.assertEqual(bad.status_code, 500)
+        self.assertIn('returned 0 results for 2 transactions', bad.get_json()['message'])
+
+    def test_failing_batch_only_fails_the_offending_request(self):
+        def predict(transactions):
+            if any(t['vendor'] == 'bad' for t in transactions):
+                raise ValueError('bad transaction')
+            return [{'category': t['vendor']} for t in transactions]
+
+        self.prediction_service.predict_categories.side_effect = predict
+
+        good, bad = self.post_concurrently([{'vendor': 'a'}], [{'vendor': 'bad'}])
+
+        self.assertEqual(good.status_code, 200)
+        self.assertEqual(good.get_json()['predictions'], [{'category': 'a'}])
+        self.assertEqual(bad.status_code, 500)
+
+    def test_rejected_dispatch_fails_requests_and_keeps_batching(self):
+        executor = MagicMock()
+        executor.submit.side_effect = RuntimeError('cannot schedule new futures after shutdown')
+
+        with patch.object(ml_routes, 'ml_executor', executor):
+            failed = self.post_predict([{'vendor': 'a'}])
+
+        self.assertEqual(failed.status_code, 500)
+        self.assertIn('after shutdown', failed.get_json()['message'])
+        self.assertTrue(ml_routes._predict_batcher.is_alive())
+
+        response = self.post_predict([{'vendor': 'b'}])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['predictions'], [{'category': 'b'}])
+
+    def test_predicts_inline_without_init_services(self):
+        with patch.object(ml_routes, '_predict_batcher', None), \
+             patch.object(ml_routes, 'ml_executor', None), \
+             patch.object(ml_routes, 'PREDICT_TIMEOUT_SECONDS', 1):
+            response = self.post_predict([{'vendor': 'a'}])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['predictions'], [{'category': 'a'}])
+
+
+class TestPredictValidation(MLRoutesTestCase):
+    """Malformed /predict requests are rejected before reaching the model"""
+
+    def assert_rejected(self, response, status_code, error):
+        self.assertEqual(response.status_code, status_code)
+        self.assertEqual(response.get_json()['error'], error)
+        self.prediction_service.predict_categories.assert_not_called()
+
+    def test_non_json_body_is_415(self):
+        response = self.client.post('/api/v1/ml/predict', data='transactions', content_type='text/plain')
+
+        self.assert_rejected(response, 415, 'Request body must be JSON')
+
+    def test_invalid_json_is_400(self):
+        response = self.client.post('/api/v1/ml/predict', data='{"transactions": [',
+                                    content_type='application/json')
+
+        self.assert_rejected(response, 400, 'Invalid JSON body')
+
+    def test_missing_transactions_is_400(self):
+        response = self.client.post('/api/v1/ml/predict', json={'items': []})
+
+        self.assertEqual(response.status_code, 400)
+        self.prediction_service.predict_categories.assert_not_called()
+
+    def test_non_object_transaction_is_400(self):
+        response = self.post_predict([{'vendor': 'a'}, 'b'])
+
+        self.assertEqual(response.status_code, 400)
+        self.prediction_service.predict_categories.assert_not_called()
+
+    def test_too_many_transactions_is_413(self):
+        with patch.object(ml_routes, 'MAX_PREDICT_TRANSACTIONS', 2):
+            response = self.post_predict([{'vendor': 'a'}] * 3)
+
+        self.assertEqual(response.status_code, 413)
+        self.prediction_service.predict_categories.assert_not_called()
+
+
+class TestRequestSize(MLRoutesTestCase):
+    """The body size limit applies to /predict only"""
+
+    def setUp(self):
+        super().setUp()
+        limit = patch.object(ml_routes, 'PREDICT_MAX_CONTENT_LENGTH', 64)
+        limit.start()
+        self.addCleanup(limit.stop)
+
+    def test_oversized_predict_body_is_413(self):
+        response = self.post_predict([{'vendor': 'x' * 100}])
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.get_json()['error'], 'Request body too large')
+        self.prediction_service.predict_categories.assert_not_called()
+
+    def test_oversized_body_is_413_without_per_request_limit(self):
+        class LegacyRequest(self.app.request_class):
+            # Flask < 3.1: max_content_length is a read-only property
+            max_content_length = property(lambda self: None)
+
+        self.app.request_class = LegacyRequest
+        response = self.post_predict([{'vendor': 'x' * 100}])
+
+        self.assertEqual(response.status_code, 413)
+        self.prediction_service.predict_categories.assert_not_called()
+
+    def test_other_routes_are_not_limited(self):
+        transaction_dao = MagicMock()
+        transaction_dao.update_transaction_category.return_value = True
+        with patch.dict(ml_routes._services, {'dao': transaction_dao}):
+            response = self.client.post('/api/v1/ml/feedback', json={
+                'transaction_id': 't1', 'user_id': 'u1', 'new_category': 'Food', 'notes': 'x' * 100
+            })
+
+        self.assertEqual(response.status_code, 200)
+
+
+class TestFeedback(MLRoutesTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.transaction_dao = MagicMock()
+        self.transaction_dao.update_transaction_category.return_value = True
+        services = patch.dict(ml_routes._services, {'dao': self.transaction_dao})
+        services.start()
+        self.addCleanup(services.stop)
+
+    def test_feedback_write_runs_on_the_request_thread(self):
+        threads = []
+        self.transaction_dao.update_transaction_category.side_effect = (
+            lambda **kwargs: threads.append(threading.current_thread()) or True
+        )
+
+        with patch.object(ml_routes, 'ml_executor') as executor:
+            response = self.client.post('/api/v1/ml/feedback', json={
+                'transaction_id': 't1', 'user_id': 'u1', 'new_category': 'Food'
+            })
+
+        self.assertEqual(response.status_code, 200)
+        executor.submit.assert_not_called()
+        self.assertEqual(threads, [threading.current_thread()])
+
+    def test_missing_fields_are_reported_in_order(self):
+        response = self.client.post('/api/v1/ml/feedback', json={'user_id': 'u1'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error'], 'Missing required fields: transaction_id, new_category')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Tests for Transaction.from_dict and Transaction.to_dict in src.models.transaction."""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from src.models.transaction import Transaction
+
+
+def _transaction_dict(**overrides):
+    data = {
+        'id': 't1',
+        'date': '2025-01-02T06:33:33Z',
+        'description': 'Coffee',
+        'amount': '$1,234.50',
+        'account_id': 'a1',
+        'user_id': 'u1',
+    }
+    data.update(overrides)
+    return data
+
+
+class TestFromDict(unittest.TestCase):
+
+    def test_unknown_keys_are_ignored(self):
+        transaction = Transaction.from_dict(_transaction_dict(gmail_thread='x', raw_html='<p>'))
+
+        self.assertEqual(transaction.id, 't1')
+        self.assertEqual(transaction.amount, 1234.5)
+        self.assertFalse(hasattr(transaction, 'gmail_thread'))
+
+    def test_z_timestamps_are_parsed_as_utc(self):
+        transaction = Transaction.from_dict(_transaction_dict(
+            created_at='2025-01-02T06:33:33Z',
+            last_modified='2025-01-02T08:33:33+02:00',
+        ))
+
+        expected = datetime(2025, 1, 2, 6, 33, 33, tzinfo=timezone.utc)
+        self.assertEqual(transaction.date, expected)
+        self.assertEqual(transaction.created_at, expected)
+        self.assertEqual(transaction.last_modified, expected)
+        self.assertEqual(transaction.last_modified.utcoffset(), timedelta(0))
+
+    def test_date_without_time_is_utc_midnight(self):
+        transaction = Transaction.from_dict(_transaction_dict(date='2025-01-02'))
+
+        self.assertEqual(transaction.date, datetime(2025, 1, 2, tzinfo=timezone.utc))
+
+    def test_legacy_keys_are_mapped(self):
+        transaction = Transaction.from_dict(_transaction_dict(merchant='Blue Bottle', category='Food'))
+
+        self.assertEqual(transaction.vendor, 'Blue Bottle')
+        self.assertEqual(transaction.vendor_cleaned, 'blue bottle')
+        self.assertEqual(transaction.predicted_category, 'Food')
+
+
+class TestToDict(unittest.TestCase):
+
+    def test_none_optional_fields_are_omitted(self):
+        transaction = Transaction(
+            id='t1', date=datetime(2025, 1, 2), description='Coffee', amount=3.5,
+            account_id='a1', user_id='u1', predicted_subcategory=None
+        )
+
+        data = transaction.to_dict()
+
+        self.assertEqual(set(data), {
+            'id', 'date', 'description', 'amount', 'account_id', 'user_id',
+            'predicted_category', 'tags', 'status'
+        })
+        self.assertEqual(data['date'], datetime(2025, 1, 2, tzinfo=timezone.utc))
+        self.assertEqual(data['tags'], [])
+
+    def test_set_optional_fields_are_kept(self):
+        transaction = Transaction(
+            id='t1', date=datetime(2025, 1, 2), description='Coffee', amount=3.5,
+            account_id='a1', user_id='u1', id_api='g1', notes='',
+            created_at=datetime(2025, 1, 2, 8, tzinfo=timezone(timedelta(hours=2)))
+        )
+
+        data = transaction.to_dict()
+
+        self.assertEqual(data['id_api'], 'g1')
+        self.assertEqual(data['notes'], '')
+        self.assertEqual(data['predicted_subcategory'], 'Uncategorized')
+        self.assertEqual(data['created_at'], datetime(2025, 1, 2, 6, tzinfo=timezone.utc))
+        self.assertNotIn('last_modified', data)
+
+    def test_round_trip(self):
+        data = Transaction.from_dict(_transaction_dict(vendor='Blue Bottle')).to_dict()
+
+        self.assertEqual(Transaction.from_dict(dict(data)).to_dict(), data)
+
+
+if __name__ == '__main__':
+    unittest.main()
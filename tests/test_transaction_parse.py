@@ -6,13 +6,14 @@ import unittest
 import logging
 import sys
 from typing import Dict, Any
-import os
 from colorama import init, Fore, Style
 import re
 import codecs
+from pathlib import Path
 # Add the project root directory to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.append(project_root)
+project_root = str(Path(__file__).resolve().parents[1])
+if project_root not in sys.path:
+    sys.path.append(project_root)
 from src.utils.transaction_parser import TransactionParser
 from src.mock.api.mock_gmail_api import get_all_mock_messages, get_mock_message_by_template
 
@@ -0,0 +1,42 @@
+"""Tests for the header helpers in src.utils.transaction_parser."""
+
+import unittest
+
+from src.utils.transaction_parser import _header_values
+
+
+class TestHeaderValues(unittest.TestCase):
+
+    def test_last_duplicate_wins(self):
+        headers = [
+            {'name': 'Subject', 'value': 'first'},
+            {'name': 'From', 'value': 'bank@example.com'},
+            {'name': 'Subject', 'value': 'second'},
+        ]
+
+        self.assertEqual(_header_values(headers, 'Subject', 'From'),
+                         {'Subject': 'second', 'From': 'bank@example.com'})
+
+    def test_only_requested_headers_are_returned(self):
+        headers = [
+            {'name': 'Date', 'value': 'Thu, 2 Jan 2025 06:33:33 +0000'},
+            {'name': 'X-Mailer', 'value': 'bank'},
+        ]
+
+        self.assertEqual(_header_values(headers, 'Subject', 'Date'),
+                         {'Date': 'Thu, 2 Jan 2025 06:33:33 +0000'})
+
+    def test_matches_dict_of_all_headers(self):
+        headers = [
+            {'name': 'Date', 'value': 'd1'},
+            {'name': 'Subject', 'value': 's1'},
+            {'name': 'Date', 'value': 'd2'},
+        ]
+        all_headers = {h['name']: h['value'] for h in headers}
+
+        self.assertEqual(_header_values(headers, 'Subject', 'Date'),
+                         {name: all_headers[name] for name in ('Subject', 'Date')})
+
+
+if __name__ == '__main__':
+    unittest.main()